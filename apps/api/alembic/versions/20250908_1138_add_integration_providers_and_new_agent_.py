@@ -15,16 +15,24 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Add monitoring providers to the integrationprovider enum
-    op.execute("ALTER TYPE integrationprovider ADD VALUE 'SENTRY'")
-    op.execute("ALTER TYPE integrationprovider ADD VALUE 'DATADOG'")
-    op.execute("ALTER TYPE integrationprovider ADD VALUE 'PAGERDUTY'")
-    op.execute("ALTER TYPE integrationprovider ADD VALUE 'CLOUDWATCH'")
-    op.execute("ALTER TYPE integrationprovider ADD VALUE 'GRAFANA'")
-    op.execute("ALTER TYPE integrationprovider ADD VALUE 'NEW_RELIC'")
-
-    # Add agent identifier to the agentidentifier enum
-    op.execute("ALTER TYPE agentidentifier ADD VALUE 'ROOT_CAUSE_ANALYSIS'")
+    # Add monitoring providers to the integrationprovider enum and the RCA agent to agentidentifier.
+    # A single DO block runs as one statement (asyncpg prepares each statement and rejects
+    # multi-command strings), so all values are added in one round trip
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            ALTER TYPE integrationprovider ADD VALUE IF NOT EXISTS 'SENTRY';
+            ALTER TYPE integrationprovider ADD VALUE IF NOT EXISTS 'DATADOG';
+            ALTER TYPE integrationprovider ADD VALUE IF NOT EXISTS 'PAGERDUTY';
+            ALTER TYPE integrationprovider ADD VALUE IF NOT EXISTS 'CLOUDWATCH';
+            ALTER TYPE integrationprovider ADD VALUE IF NOT EXISTS 'GRAFANA';
+            ALTER TYPE integrationprovider ADD VALUE IF NOT EXISTS 'NEW_RELIC';
+            ALTER TYPE agentidentifier ADD VALUE IF NOT EXISTS 'ROOT_CAUSE_ANALYSIS';
+        END
+        $$
+        """
+    )
 
 
 def downgrade() -> None:
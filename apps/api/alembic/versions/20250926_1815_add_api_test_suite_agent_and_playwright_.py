@@ -16,12 +16,24 @@ depends_on = None
 
 
 def upgrade() -> None:
-    # Add API Testing Suite agent identifier and Playwright integration provider
-    op.execute("ALTER TYPE agentidentifier ADD VALUE 'API_TESTING_SUITE'")
-    op.execute("ALTER TYPE integrationprovider ADD VALUE 'PLAYWRIGHT'")
+    # Add API Testing Suite agent identifier and Playwright integration provider in one DO block
+    # (a single statement, so asyncpg's prepared statements accept it)
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            ALTER TYPE agentidentifier ADD VALUE IF NOT EXISTS 'API_TESTING_SUITE';
+            ALTER TYPE integrationprovider ADD VALUE IF NOT EXISTS 'PLAYWRIGHT';
+        END
+        $$
+        """
+    )
 
 
 def downgrade() -> None:
-    # Remove API Testing Suite agent identifier and Playwright integration provider
-    op.execute("ALTER TYPE agentidentifier DROP VALUE 'API_TESTING_SUITE'")
-    op.execute("ALTER TYPE integrationprovider DROP VALUE 'PLAYWRIGHT'")
+    # PostgreSQL has no ALTER TYPE ... DROP VALUE, and rows may already use these values, so this
+    # revision cannot be reverted in place; fail loudly instead of silently keeping the values
+    raise NotImplementedError(
+        "Cannot remove 'API_TESTING_SUITE' / 'PLAYWRIGHT' from their enum types: PostgreSQL does not "
+        "support dropping enum values. Recreate the types manually if this downgrade is required."
+    )
@@ -0,0 +1,84 @@
+"""store agent identifier and integration provider enums as varchar
+
+Revision ID: 675a67888bf7
+Revises: 07f5dbabd4b1
+Create Date: 2026-10-17 10:00:12.418305
+
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "675a67888bf7"
+down_revision = "07f5dbabd4b1"
+branch_labels = None
+depends_on = None
+
+AGENT_IDENTIFIERS = (
+    "CODE_ANALYSIS",
+    "TEST_CASE_GENERATION",
+    "REQUIREMENTS_TO_TICKETS",
+    "CODE_REVIEWER",
+    "ROOT_CAUSE_ANALYSIS",
+    "API_TESTING_SUITE",
+)
+INTEGRATION_PROVIDERS = (
+    "GITHUB",
+    "ATLASSIAN",
+    "NOTION",
+    "SENTRY",
+    "DATADOG",
+    "PAGERDUTY",
+    "CLOUDWATCH",
+    "GRAFANA",
+    "NEW_RELIC",
+    "PLAYWRIGHT",
+)
+
+
+def upgrade() -> None:
+    """Convert native enum columns to varchar so new agents/providers no longer need DDL.
+
+    Values are validated by the non-native SQLAlchemy Enum on the model side.
+    """
+    op.alter_column(
+        "ai_agents",
+        "identifier",
+        existing_type=sa.Enum(*AGENT_IDENTIFIERS, name="agentidentifier"),
+        type_=sa.String(length=64),
+        existing_nullable=False,
+        postgresql_using="identifier::text",
+    )
+    op.alter_column(
+        "integrations",
+        "type",
+        existing_type=sa.Enum(*INTEGRATION_PROVIDERS, name="integrationprovider"),
+        type_=sa.String(length=64),
+        existing_nullable=False,
+        postgresql_using="type::text",
+    )
+    op.execute("DROP TYPE IF EXISTS agentidentifier")
+    op.execute("DROP TYPE IF EXISTS integrationprovider")
+
+
+def downgrade() -> None:
+    """Restore the native enum types and cast the columns back."""
+    sa.Enum(*AGENT_IDENTIFIERS, name="agentidentifier").create(op.get_bind(), checkfirst=True)
+    sa.Enum(*INTEGRATION_PROVIDERS, name="integrationprovider").create(op.get_bind(), checkfirst=True)
+    op.alter_column(
+        "ai_agents",
+        "identifier",
+        existing_type=sa.String(length=64),
+        type_=sa.Enum(*AGENT_IDENTIFIERS, name="agentidentifier"),
+        existing_nullable=False,
+        postgresql_using="identifier::agentidentifier",
+    )
+    op.alter_column(
+        "integrations",
+        "type",
+        existing_type=sa.String(length=64),
+        type_=sa.Enum(*INTEGRATION_PROVIDERS, name="integrationprovider"),
+        existing_nullable=False,
+        postgresql_using="type::integrationprovider",
+    )
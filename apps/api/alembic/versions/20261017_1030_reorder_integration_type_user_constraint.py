@@ -0,0 +1,48 @@
+"""reorder integration type user constraint
+
+Revision ID: 721e3f13798f
+Revises: 675a67888bf7
+Create Date: 2026-10-17 10:30:41.902716
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "721e3f13798f"
+down_revision = "675a67888bf7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Lead the unique constraint with created_by.
+
+    Integration queries always filter by the owning user and only sometimes by type, so
+    (created_by, type) lets the constraint's index serve both lookups via its leftmost prefix.
+    The index is built CONCURRENTLY and then swapped in, so the table is only locked for the swap.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_integration_created_by_type_ix "
+            "ON integrations (created_by, type)"
+        )
+    op.execute(
+        "ALTER TABLE integrations "
+        "DROP CONSTRAINT uq_integration_type_user, "
+        "ADD CONSTRAINT uq_integration_type_user UNIQUE USING INDEX uq_integration_created_by_type_ix"
+    )
+
+
+def downgrade() -> None:
+    """Restore the original (type, created_by) column order."""
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_integration_type_created_by_ix "
+            "ON integrations (type, created_by)"
+        )
+    op.execute(
+        "ALTER TABLE integrations "
+        "DROP CONSTRAINT uq_integration_type_user, "
+        "ADD CONSTRAINT uq_integration_type_user UNIQUE USING INDEX uq_integration_type_created_by_ix"
+    )
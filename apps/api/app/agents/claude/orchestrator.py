@@ -1,7 +1,6 @@
 """Claude Code orchestration for agent workflows."""
 import re
-from collections.abc import AsyncGenerator
-from copy import deepcopy
+from collections.abc import AsyncGenerator, Callable, Iterator
 from pathlib import Path
 from typing import Any
 from uuid import uuid4
@@ -39,6 +38,47 @@ TOOL_MAPPING = {
     "ExitPlanMode": "exit_plan_mode",
     "Glob": "glob_files",
 }
+# Pre-bound lookup used on the streaming path for every tool call event
+_map_tool_name = TOOL_MAPPING.get
+
+# Shared by every orchestrator instance; run() hands the SDK its own list copy
+_DEFAULT_ALLOWED_TOOLS = (
+    "Read",
+    "Bash",
+    "Grep",
+    "LS",
+    "TodoWrite",
+    "Write",
+    "Edit",
+    "MultiEdit",
+    "WebFetch",
+    "WebSearch",
+)
+
+_VALID_PERMISSION_MODES = frozenset({"default", "acceptEdits", "bypassPermissions"})
+
+_ROLE_PREFIXES = {"user": "User: ", "assistant": "Assistant: ", "system": "System: "}
+
+_THINKING_RE = re.compile(r"<thinking>(.*?)</thinking>", re.DOTALL)
+
+# Event type tags shared by every event built on the streaming path
+_TEXT_TYPE = "text"
+_THINKING_TYPE = "thinking"
+_TOOL_CALL_TYPE = "tool_call"
+_TOOL_RESULT_TYPE = "tool_result"
+_FINISH_TYPE = "finish"
+
+
+def _text_message(text: str) -> dict[str, Any]:
+    return {"type": _TEXT_TYPE, "data": {"text": text}}
+
+
+def _thinking_message(text: str, signature: str) -> dict[str, Any]:
+    return {"type": _THINKING_TYPE, "data": {"text": text, "signature": signature}}
+
+
+def _tool_result_message(tool_call_id: str, result: Any) -> dict[str, Any]:
+    return {"type": _TOOL_RESULT_TYPE, "toolCallId": tool_call_id, "result": result}
 
 
 class ClaudeOrchestrator:
@@ -60,26 +100,14 @@ class ClaudeOrchestrator:
         resume_session_id: str | None = None,
     ) -> None:
         """Initialize Claude orchestrator."""
-        self.settings = get_settings()
-        # Configure Claude Code SDK options
-        permission_mode = getattr(self.settings, "CLAUDE_PERMISSION_MODE", "bypassPermissions")
-        if permission_mode not in ["default", "acceptEdits", "bypassPermissions"]:
+        # Configure Claude Code SDK options; settings are read from the cached singleton rather than kept per instance
+        permission_mode = get_settings().CLAUDE_PERMISSION_MODE
+        if permission_mode not in _VALID_PERMISSION_MODES:
             permission_mode = "bypassPermissions"
 
         # Build Claude Code options with optional resume session
-        claude_options_kwargs = {
-            "allowed_tools": [
-                "Read",
-                "Bash",
-                "Grep",
-                "LS",
-                "TodoWrite",
-                "Write",
-                "Edit",
-                "MultiEdit",
-                "WebFetch",
-                "WebSearch",
-            ],
+        claude_options_kwargs: dict[str, Any] = {
+            "allowed_tools": _DEFAULT_ALLOWED_TOOLS,
             "cwd": base_dir,
             "permission_mode": permission_mode,
             "mcp_servers": mcp_configs,
@@ -115,128 +143,182 @@ class ClaudeOrchestrator:
                 extra={"message_count": len(messages), "prompt_length": len(prompt)},
             )
 
-            # Prepare claude options
-            claude_options_dict = deepcopy(self.claude_options)
-            claude_options_dict.update(options)
+            # Prepare claude options; a shallow merge is enough since only the top-level keys vary per call,
+            # and the mutable containers are copied so the SDK can never mutate the shared template
+            claude_options_dict = {
+                **self.claude_options,
+                "allowed_tools": list(self.claude_options["allowed_tools"]),
+                "mcp_servers": dict(self.claude_options["mcp_servers"]),
+                **options,
+            }
             claude_options = ClaudeCodeOptions(**claude_options_dict)  # type: ignore[arg-type]
 
             # Stream responses from Claude Code SDK directly
             async for response in query(prompt=prompt, options=claude_options):
-                logger.debug(f"Received message type: {type(response).__name__}")
-
-                if isinstance(response, SystemMessage):
-                    logger.debug(f"--> System Message: {response}")
-                    yield {"type": "system", "data": response.data}
-
-                elif isinstance(response, AssistantMessage):
-                    logger.debug(f"--> Assistant Message: {response}")
-                    for block in response.content:
-                        if isinstance(block, TextBlock):
-                            # Extract thinking block if it exists in the text
-                            remaining_text, thinking_block = self._extract_and_yield_thinking_block(block.text)
-                            if thinking_block:
-                                yield thinking_block
-                                if remaining_text:
-                                    yield {"type": "text", "data": {"text": remaining_text}}
-                            else:
-                                # for normal text block
-                                yield {"type": "text", "data": {"text": block.text}}
-
-                        elif isinstance(block, ThinkingBlock):
-                            logger.debug(f"Claude thinking: {block.thinking}")
-                            yield {"type": "thinking", "data": {"text": block.thinking, "signature": block.signature}}
-
-                        elif isinstance(block, ToolUseBlock):
-                            tool_call_id = block.id
-                            tool_name = block.name
-                            tool_args = block.input
-
-                            yield {
-                                "type": "tool_call",
-                                "toolCallId": tool_call_id,
-                                "toolName": self.parse_tool_name(tool_name),
-                                "args": tool_args,
-                            }
-
-                elif isinstance(response, UserMessage):
-                    logger.debug(f"--> User Message: {response}")
-                    for user_block in getattr(response, "content", []):
-                        if isinstance(user_block, TextBlock):
-                            yield {"type": "text", "data": {"text": user_block.text}}
-                        elif isinstance(user_block, ToolResultBlock):
-                            yield {
-                                "type": "tool_result",
-                                "toolCallId": user_block.tool_use_id,
-                                "result": user_block.content,
-                            }
-                        elif isinstance(user_block, dict):
-                            # Fallback for dict-style tool results - backward compatibility
-                            if user_block.get("type") == "tool_result":
-                                yield {
-                                    "type": "tool_result",
-                                    "toolCallId": user_block.get("tool_use_id", ""),
-                                    "result": user_block.get("content", ""),
-                                }
-
-                elif isinstance(response, ResultMessage):
-                    logger.debug(f"--> Result Message: {response}")
-                    # Commenting this, as this is causing duplicate text blocks in the stream
-                    # yield {"type": "text", "data": {"text": response.result}}
-                    # finish the stream
-                    yield {
-                        "type": "finish",
-                        "data": {
-                            "finishReason": "error" if response.is_error else "stop",
-                            "duration_ms": response.duration_ms,
-                            "duration_api_ms": response.duration_api_ms,
-                            "total_cost_usd": response.total_cost_usd,
-                            "session_id": response.session_id,
-                            "usage": response.usage,
-                        },
-                    }
+                # Positional args keep loguru from formatting (and repr-ing SDK objects) unless debug is enabled
+                logger.debug("Received message type: {}", type(response).__name__)
+
+                handler = _lookup_handler(_MESSAGE_HANDLERS, response)
+                if handler is not None:
+                    for event in handler(self, response):
+                        yield event
             logger.info("Claude Code SDK query completed")
 
         except Exception as e:
             logger.error(f"Claude Code SDK query failed: {e}")
             yield {
-                "type": "finish",
+                "type": _FINISH_TYPE,
                 "data": {"finishReason": "error", "message": f"Claude Code SDK query failed: {e}"},
             }
 
+    def _handle_system_message(self, response: SystemMessage) -> Iterator[dict[str, Any]]:
+        logger.debug("--> System Message: {}", response)
+        yield {"type": "system", "data": response.data}
+
+    def _handle_assistant_message(self, response: AssistantMessage) -> Iterator[dict[str, Any]]:
+        logger.debug("--> Assistant Message: {}", response)
+        # Consecutive text blocks are coalesced into one event, flushed at thinking/tool boundaries
+        pending_text: list[str] = []
+        for block in response.content:
+            if isinstance(block, TextBlock):
+                # Extract thinking block if it exists in the text
+                remaining_text, thinking_block = self._extract_and_yield_thinking_block(block.text)
+                if thinking_block:
+                    if pending_text:
+                        yield _text_message("\n\n".join(pending_text))
+                        pending_text = []
+                    yield thinking_block
+                    if remaining_text:
+                        pending_text.append(remaining_text)
+                else:
+                    # for normal text block
+                    pending_text.append(block.text)
+                continue
+
+            if pending_text:
+                yield _text_message("\n\n".join(pending_text))
+                pending_text = []
+            handler = _lookup_handler(_ASSISTANT_BLOCK_HANDLERS, block)
+            if handler is not None:
+                yield from handler(self, block)
+
+        if pending_text:
+            yield _text_message("\n\n".join(pending_text))
+
+    def _handle_user_message(self, response: UserMessage) -> Iterator[dict[str, Any]]:
+        logger.debug("--> User Message: {}", response)
+        for user_block in getattr(response, "content", []):
+            # Legacy dict literals are matched by exact type, keeping them out of the subclass fallback
+            if type(user_block) is dict:
+                yield from self._handle_dict_block(user_block)
+                continue
+            handler = _lookup_handler(_USER_BLOCK_HANDLERS, user_block)
+            if handler is not None:
+                yield from handler(self, user_block)
+
+    def _handle_result_message(self, response: ResultMessage) -> Iterator[dict[str, Any]]:
+        logger.debug("--> Result Message: {}", response)
+        # Commenting this, as this is causing duplicate text blocks in the stream
+        # yield {"type": "text", "data": {"text": response.result}}
+        # finish the stream
+        yield {
+            "type": _FINISH_TYPE,
+            "data": {
+                "finishReason": "error" if response.is_error else "stop",
+                "duration_ms": response.duration_ms,
+                "duration_api_ms": response.duration_api_ms,
+                "total_cost_usd": response.total_cost_usd,
+                "session_id": response.session_id,
+                "usage": response.usage,
+            },
+        }
+
+    def _handle_thinking_block(self, block: ThinkingBlock) -> Iterator[dict[str, Any]]:
+        logger.debug("Claude thinking: {}", block.thinking)
+        yield _thinking_message(block.thinking, block.signature)
+
+    def _handle_tool_use_block(self, block: ToolUseBlock) -> Iterator[dict[str, Any]]:
+        tool_name = block.name
+        yield {
+            "type": _TOOL_CALL_TYPE,
+            "toolCallId": block.id,
+            "toolName": _map_tool_name(tool_name, tool_name),
+            "args": block.input,
+        }
+
+    def _handle_user_text_block(self, block: TextBlock) -> Iterator[dict[str, Any]]:
+        yield _text_message(block.text)
+
+    def _handle_tool_result_block(self, block: ToolResultBlock) -> Iterator[dict[str, Any]]:
+        yield _tool_result_message(block.tool_use_id, block.content)
+
+    def _handle_dict_block(self, block: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        # Fallback for dict-style tool results - backward compatibility
+        if block.get("type") == _TOOL_RESULT_TYPE:
+            yield _tool_result_message(block.get("tool_use_id", ""), block.get("content", ""))
+
     def parse_tool_name(self, llm_tool_name: str) -> str:
         """
         Map Claude tool names to Agent Workflow compatible names.
         """
-        return TOOL_MAPPING.get(llm_tool_name, llm_tool_name)
+        return _map_tool_name(llm_tool_name, llm_tool_name)
 
     def _prepare_llm_prompt(self, messages: list[dict[str, Any]]) -> str:
         """
         Convert chat messages to a simple prompt string for Claude Code SDK.
         Uses the utility function to handle both simple and parts-based messages.
         """
-        prompt_parts = []
-
-        for message in messages:
-            if message["role"] == "user":
-                prompt_parts.append(f"User: {message['content']}")
-            elif message["role"] == "assistant":
-                prompt_parts.append(f"Assistant: {message['content']}")
-            elif message["role"] == "system":
-                prompt_parts.append(f"System: {message['content']}")
-
-        return "\n\n".join(prompt_parts)
+        return "\n\n".join(
+            f"{_ROLE_PREFIXES[message['role']]}{message['content']}"
+            for message in messages
+            if message["role"] in _ROLE_PREFIXES
+        )
 
     def _extract_and_yield_thinking_block(self, text: str) -> tuple[str, dict[str, Any] | None]:
         """
         Extract and yield thinking block from the text.
         """
-        thinking_match = re.search(r"<thinking>(.*?)</thinking>", text, re.DOTALL)
-        if thinking_match:
-            thinking_text = thinking_match.group(1).strip()
-            thinking_message = {
-                "type": "thinking",
-                "data": {"text": thinking_text, "signature": f"reasoning_{uuid4().hex}"},
-            }
-            remaining_text = re.sub(r"<thinking>.*?</thinking>", "", text, flags=re.DOTALL).strip()
-            return remaining_text, thinking_message
+        # Capture thinking payloads while stripping them, so the text is scanned only once
+        thinking_parts: list[str] = []
+
+        def _collect(match: re.Match[str]) -> str:
+            thinking_parts.append(match.group(1))
+            return ""
+
+        remaining_text = _THINKING_RE.sub(_collect, text)
+        if thinking_parts:
+            thinking_message = _thinking_message(thinking_parts[0].strip(), f"reasoning_{uuid4().hex}")
+            return remaining_text.strip(), thinking_message
         return "", None
+
+
+_Handler = Callable[[ClaudeOrchestrator, Any], Iterator[dict[str, Any]]]
+
+
+def _lookup_handler(handlers: dict[type, _Handler], obj: Any) -> _Handler | None:
+    """Resolve a handler by exact type, falling back to isinstance for subclasses."""
+    handler = handlers.get(type(obj))
+    if handler is None:
+        for cls, candidate in handlers.items():
+            if isinstance(obj, cls):
+                return candidate
+    return handler
+
+
+# Dispatch tables keyed by SDK message/block type, replacing per-event isinstance ladders
+_MESSAGE_HANDLERS: dict[type, _Handler] = {
+    AssistantMessage: ClaudeOrchestrator._handle_assistant_message,
+    UserMessage: ClaudeOrchestrator._handle_user_message,
+    SystemMessage: ClaudeOrchestrator._handle_system_message,
+    ResultMessage: ClaudeOrchestrator._handle_result_message,
+}
+
+_ASSISTANT_BLOCK_HANDLERS: dict[type, _Handler] = {
+    ThinkingBlock: ClaudeOrchestrator._handle_thinking_block,
+    ToolUseBlock: ClaudeOrchestrator._handle_tool_use_block,
+}
+
+_USER_BLOCK_HANDLERS: dict[type, _Handler] = {
+    TextBlock: ClaudeOrchestrator._handle_user_text_block,
+    ToolResultBlock: ClaudeOrchestrator._handle_tool_result_block,
+}
@@ -14,6 +14,14 @@ class AgentIdentifier(str, Enum):
     API_TESTING_SUITE = "api_testing_suite"
 
 
+_AGENT_IDENTIFIER_LOOKUP = AgentIdentifier._value2member_map_
+
+
+def parse_agent_identifier(value: str) -> AgentIdentifier | None:
+    """Return the AgentIdentifier for a raw value, or None if it is not a known identifier."""
+    return _AGENT_IDENTIFIER_LOOKUP.get(value)  # type: ignore[return-value]
+
+
 class AgentModule(str, Enum):
     """Agent capability modules."""
 
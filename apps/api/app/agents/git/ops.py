@@ -1,13 +1,19 @@
 """Thin wrappers for git clone, sparse checkout, etc."""
 
 import asyncio
+import contextlib
 import os
 import shutil
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from pathlib import Path
+from typing import Any
 from urllib.parse import urlparse
 
 from loguru import logger
 
+# Upper bound on concurrent git subprocesses for batched clones
+DEFAULT_CLONE_CONCURRENCY = 4
+
 
 class GitOperationError(Exception):
     """Raised when git operations fail."""
@@ -49,6 +55,9 @@ class GitOps:
         branch: str = "main",
         shallow: bool = True,
         access_token: str | None = None,
+        depth: int | None = 1,
+        single_branch: bool = True,
+        filter_spec: str | None = "blob:none",
     ) -> Path:
         """
         Clone a repository to the specified destination.
@@ -59,6 +68,9 @@ class GitOps:
             branch: Git branch to checkout
             shallow: Whether to perform shallow clone
             access_token: Access token for HTTPS hosts (optional)
+            depth: History depth for shallow clones (None for full history)
+            single_branch: Whether shallow clones fetch only the requested branch
+            filter_spec: Partial clone filter for shallow clones, e.g. "blob:none" (None to disable)
 
         Returns:
             str: Path to cloned repository
@@ -70,16 +82,14 @@ class GitOps:
             # Validate URL
             self._validate_repo_url(url)
 
-            # Create destination directory
-            destination_dir.mkdir(parents=True, exist_ok=True)
+            # Create destination directory off the event loop
+            await asyncio.to_thread(destination_dir.mkdir, parents=True, exist_ok=True)
 
-            # Generate repo directory name
-            repo_name = self._extract_repo_name(url)
-            repo_path = destination_dir / repo_name
+            # Generate repo directory path
+            repo_path = self.checkout_path(url=url, destination_dir=destination_dir)
 
-            # Remove existing directory if it exists
-            if repo_path.exists():
-                shutil.rmtree(repo_path)
+            # Remove existing directory if it exists, off the event loop since large trees take a while
+            await asyncio.to_thread(self._remove_existing_dir, repo_path)
 
             # If an access token is provided for HTTPS hosts, inject it into the URL (avoid logging the token)
             tokenized_url = self._build_authenticated_url(url=url, access_token=access_token)
@@ -88,14 +98,22 @@ class GitOps:
             clone_cmd = ["git", "clone"]
 
             if shallow:
-                clone_cmd.extend(["--depth", "1"])
+                # Partial clone: limited history, no tags, and blobs fetched lazily on checkout/read
+                if depth:
+                    clone_cmd.extend(["--depth", str(depth)])
+                if single_branch:
+                    clone_cmd.append("--single-branch")
+                if filter_spec:
+                    clone_cmd.append(f"--filter={filter_spec}")
+                clone_cmd.append("--no-tags")
 
-            clone_cmd.extend(["--branch", branch, tokenized_url, repo_name])
+            clone_cmd.extend(["--branch", branch, tokenized_url, repo_path.name])
 
             # Redact token in logs if present
             safe_url = url
             if access_token and isinstance(access_token, str) and access_token:
-                safe_url = "<token_redacted>://" + urlparse(url).netloc + urlparse(url).path
+                parsed_url = urlparse(url)
+                safe_url = "<token_redacted>://" + parsed_url.netloc + parsed_url.path
             logger.info(f"Cloning repository: {safe_url} -> {repo_path}")
 
             env = os.environ.copy()
@@ -106,7 +124,14 @@ class GitOps:
                 *clone_cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, cwd=destination_dir, env=env
             )
 
-            stdout, stderr = await process.communicate()
+            try:
+                stdout, stderr = await process.communicate()
+            except asyncio.CancelledError:
+                # Do not leave git writing into the checkout dir once the caller has given up on the clone
+                with contextlib.suppress(ProcessLookupError):
+                    process.kill()
+                await process.wait()
+                raise
 
             if process.returncode != 0:
                 error_msg = f"Git clone failed: {stderr.decode()}"
@@ -120,6 +145,71 @@ class GitOps:
             logger.error(f"Failed to clone repository {url}: {e}")
             raise GitOperationError(f"Failed to clone repository {url}: {e}") from e
 
+    async def clone_many(
+        self,
+        specs: list[dict[str, Any]],
+        *,
+        concurrency: int = DEFAULT_CLONE_CONCURRENCY,
+        on_cloned: Callable[[int, Path], Awaitable[None]] | None = None,
+    ) -> AsyncGenerator[tuple[int, Path | Exception], None]:
+        """
+        Clone several repositories concurrently, yielding each result as soon as its clone finishes.
+
+        Specs that resolve to the same checkout directory are cloned one at a time, since each
+        clone wipes that directory first. Closing the iterator early cancels (and kills) any
+        clones still running.
+
+        Args:
+            specs: Keyword arguments for each `clone_repository` call
+            concurrency: Maximum number of git processes running at once
+            on_cloned: Optional hook run with (spec index, repo path) after each successful clone,
+                while that checkout directory is still locked
+
+        Yields:
+            tuple: Spec index and the cloned repository path, or the raised exception
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        checkout_locks: dict[Path, asyncio.Lock] = {}
+
+        async def _clone(index: int, spec: dict[str, Any], checkout_lock: asyncio.Lock) -> tuple[int, Path | Exception]:
+            try:
+                # Take the checkout lock first so clones waiting on a shared dir do not hold a semaphore slot
+                async with checkout_lock, semaphore:
+                    repo_path = await self.clone_repository(**spec)
+                    if on_cloned is not None:
+                        await on_cloned(index, repo_path)
+                return index, repo_path
+            except Exception as e:
+                return index, e
+
+        tasks = [
+            asyncio.create_task(
+                _clone(
+                    index,
+                    spec,
+                    checkout_locks.setdefault(
+                        self.checkout_path(url=spec["url"], destination_dir=spec["destination_dir"]), asyncio.Lock()
+                    ),
+                )
+            )
+            for index, spec in enumerate(specs)
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            # Stop outstanding clones and let their git processes exit before returning
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.wait(tasks)
+
+    @staticmethod
+    def _remove_existing_dir(path: Path) -> None:
+        """Remove a directory tree if it exists (blocking; run via a worker thread)."""
+        if path.exists():
+            shutil.rmtree(path)
+
     def _validate_repo_url(self, url: str) -> None:
         """
         Validate repository URL.
@@ -146,6 +236,22 @@ class GitOps:
         except Exception as e:
             raise GitOperationError(f"Invalid repository URL: {url}") from e
 
+    def checkout_path(self, *, url: str, destination_dir: Path) -> Path:
+        """
+        Return the directory `clone_repository` clones `url` into.
+
+        Different URLs can map to the same directory (e.g. with and without `.git`), so
+        concurrent callers should serialize clones that share a checkout path.
+
+        Args:
+            url: Repository URL
+            destination_dir: Directory to clone into
+
+        Returns:
+            Path: Checkout directory for the repository
+        """
+        return destination_dir / self._extract_repo_name(url)
+
     def _extract_repo_name(self, url: str) -> str:
         """
         Extract repository name from URL.
@@ -193,7 +299,7 @@ class GitOps:
             GitOperationError: If branch creation fails
         """
         try:
-            if not repo_path.exists():
+            if not await asyncio.to_thread(repo_path.exists):
                 raise GitOperationError(f"Repository path does not exist: {repo_path}")
 
             # Check if branch already exists
@@ -1,22 +1,22 @@
 """API Testing Suite generation agent workflow implementation."""
 
+import contextlib
 import json
+import os
 from collections.abc import AsyncIterator
 from datetime import datetime
 from pathlib import Path
-from typing import Any
-from urllib.parse import urlparse
+from typing import Any, ClassVar
 
 from loguru import logger
 
 from app.agents.enums import AgentIdentifier
-from app.agents.git.ops import GitOperationError, GitOps
+from app.agents.git.ops import GitOps
 from app.agents.workflows.base import AgentWorkflow
 from app.agents.workflows.factory import register
-from app.integrations.enums import IntegrationProvider
 from app.models.user_agent_session import UserAgentSession
 from app.services.integration_service import IntegrationService
-from app.utils.helpers import try_parse_json_content
+from app.utils.helpers import is_github_url, stable_digest, try_parse_json_content
 
 
 @register(AgentIdentifier.API_TESTING_SUITE)
@@ -25,6 +25,15 @@ class ApiTestingSuiteWorkflow(AgentWorkflow):
 
     identifier = AgentIdentifier.API_TESTING_SUITE
 
+    # Content type by final file extension (".spec.ts" resolves via "ts")
+    _CONTENT_TYPES: ClassVar[dict[str, str]] = {
+        "json": "json",
+        "ts": "typescript",
+        "js": "javascript",
+        "java": "java",
+        "py": "python",
+    }
+
     def __init__(
         self,
         *,
@@ -42,17 +51,10 @@ class ApiTestingSuiteWorkflow(AgentWorkflow):
             system_prompt=system_prompt,
             llm_session_id=llm_session_id,
         )
-        # Track file-op tool calls until their corresponding tool_result arrives
-        self._pending_artifact_ops: dict[str, dict[str, Any]] = {}
+        # Parsed index.json relevantArtifacts filenames, keyed by the file's (mtime_ns, size)
+        self._relevant_artifacts_cache: tuple[int, int, frozenset[str]] | None = None
         self.git_ops = GitOps()
 
-    async def _get_github_token(self) -> str | None:
-        """Get the GitHub token for the session."""
-        integration = await self.integration_service.crud.get_by_provider(provider=IntegrationProvider.GITHUB)
-        if integration:
-            return await self.integration_service.get_access_token(integration_id=integration.id)  # type: ignore
-        return None
-
     async def prepare(
         self, *, session: UserAgentSession, messages: list[dict[str, Any]]
     ) -> AsyncIterator[dict[str, Any]]:
@@ -61,43 +63,34 @@ class ApiTestingSuiteWorkflow(AgentWorkflow):
         Creates organized directory structure: artifacts/automation/ for generated test files
         and artifacts/repo/ for cloned repository with automation branch.
         """
-        logger.info(f"Preparing workspace {self.workspace_dir} for API testing suite generation")
+        logger.info("Preparing workspace {} for API testing suite generation", self.workspace_dir)
 
         try:
             artifacts_dir = self.workspace_dir / "artifacts"
-            artifacts_dir.mkdir(parents=True, exist_ok=True)
 
-            # Create subdirectories for generated test files and repository
+            # Create artifacts/ and artifacts/repo/ in a single worker-thread hop
             repo_dir = artifacts_dir / "repo"
-            repo_dir.mkdir(parents=True, exist_ok=True)
+            await self._make_dirs(repo_dir)
 
-            # Extract repository from session properties
+            # Extract repositories from session properties; accepts a single repo or a list of repos
             properties = session.custom_properties
             repo_data = properties.get("repo", {})
+            repos = self._collect_repos(repo_data)
 
-            if repo_data and repo_data.get("url"):
-                logger.info(f"Found repository to clone: {repo_data.get('url')}")
+            if repos:
+                logger.info(f"Found {len(repos)} repository(ies) to clone")
 
                 # Get GitHub token for authentication
                 github_token = await self._get_github_token()
 
-                # Extract repository details
-                repo_url = repo_data.get("url")
-                repo_branch = repo_data.get("branch", "main")
-
-                if not repo_url:
-                    logger.warning("Repository URL not provided")
-                else:
-                    logger.info(f"Cloning repository: {repo_url}")
-                    host = urlparse(repo_url).netloc.lower()
-                    access_token = github_token if "github.com" in host else None
-
-                    tool_call_id = f"git_clone_{hash(str(repo_url))}"
+                # One automation branch name per run, shared by every cloned repository
+                automation_branch = f"automation-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
-                    # Emit git clone tool call event
+                # Emit git clone tool call events up front, then clone concurrently
+                for repo_url, _ in repos:
                     yield {
                         "type": "tool_call",
-                        "toolCallId": tool_call_id,
+                        "toolCallId": f"git_clone_{stable_digest(repo_url)}",
                         "toolName": "git_clone",
                         "args": {
                             "url": repo_url,
@@ -105,49 +98,40 @@ class ApiTestingSuiteWorkflow(AgentWorkflow):
                         },
                     }
 
-                    try:
-                        # Clone the repository
-                        repo_path = await self.git_ops.clone_repository(
-                            url=repo_url,
-                            destination_dir=repo_dir,
-                            branch=repo_branch,
-                            access_token=access_token,
-                        )
-
-                        # Create automation branch with timestamp
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        automation_branch = f"automation-{timestamp}"
-
-                        logger.info(f"Creating automation branch: {automation_branch}")
-                        await self.git_ops.create_branch(
-                            repo_path=repo_path,
-                            branch_name=automation_branch,
-                            source_branch=repo_branch,
-                        )
-
-                        # Emit successful tool result
-                        yield {
-                            "type": "tool_result",
-                            "toolCallId": tool_call_id,
-                            "result": f"Repository {repo_url} successfully cloned to: {repo_path} and automation branch '{automation_branch}' created",
-                        }
-
-                        logger.info(
-                            f"Successfully prepared repository {repo_url} with automation branch {automation_branch}"
-                        )
+                # Clone only the working tree of the target branch; tests are generated against HEAD
+                specs = [
+                    {
+                        "url": repo_url,
+                        "destination_dir": repo_dir,
+                        "branch": repo_branch,
+                        "access_token": github_token if is_github_url(repo_url) else None,
+                        "depth": 1,
+                        "single_branch": True,
+                        "filter_spec": "blob:none",
+                    }
+                    for repo_url, repo_branch in repos
+                ]
+
+                async def _create_automation_branch(index: int, repo_path: Path) -> None:
+                    logger.info(f"Creating automation branch: {automation_branch}")
+                    await self.git_ops.create_branch(
+                        repo_path=repo_path,
+                        branch_name=automation_branch,
+                        source_branch=repos[index][1],
+                    )
 
-                    except GitOperationError as e:
-                        # Emit error tool result
-                        yield {
-                            "type": "tool_result",
-                            "toolCallId": tool_call_id,
-                            "result": f"Error cloning repository {repo_url}: {e}",
-                        }
-                        logger.error(f"Failed to clone repository {repo_url}: {e}")
+                # Emit each tool result as soon as its clone finishes; aclosing cancels in-flight clones
+                # if the consumer goes away early
+                async with contextlib.aclosing(
+                    self.git_ops.clone_many(specs, on_cloned=_create_automation_branch)
+                ) as results:
+                    async for index, result in results:
+                        yield self._clone_result_event(repos[index][0], result, automation_branch)
             else:
                 logger.info("No repositories specified for cloning")
 
-            logger.info(f"mcp configs: {self.mcp_configs}")
+            # Positional args defer the (potentially large) repr until a sink accepts the record
+            logger.info("mcp configs: {}", self.mcp_configs)
             logger.info(
                 "Workspace prepared for API testing suite generation", extra={"artifacts_dir": str(artifacts_dir)}
             )
@@ -156,67 +140,59 @@ class ApiTestingSuiteWorkflow(AgentWorkflow):
             # Do not fail streaming if FS prep fails; LLM can still attempt writes
             logger.warning(f"Workspace preparation skipped or partially completed: {exc}")
 
-        for _ in ():
-            yield {}
-
-    async def _maybe_intercept_artifact_event(self, response: dict[str, Any]) -> tuple[bool, dict[str, Any] | None]:
-        """Intercept file operation tool events and emit normalized artifact events.
+    def _collect_repos(self, repo_data: Any) -> list[tuple[str, str]]:
+        """Normalize the `repo` session property into unique (url, branch) pairs."""
+        entries = repo_data if isinstance(repo_data, list) else [repo_data]
+        repos: dict[str, str] = {}
+        for entry in entries:
+            if isinstance(entry, dict) and entry.get("url"):
+                repos.setdefault(entry["url"], entry.get("branch", "main"))
+        return list(repos.items())
+
+    def _clone_result_event(self, repo_url: str, result: Path | Exception, automation_branch: str) -> dict[str, Any]:
+        """Build the git_clone tool result event for a repository's clone outcome."""
+        tool_call_id = f"git_clone_{stable_digest(repo_url)}"
+        if isinstance(result, Exception):
+            # The cached token may have been revoked or rotated; refetch it next time
+            self._invalidate_github_token()
+            logger.error(f"Failed to clone repository {repo_url}: {result}")
+            return {
+                "type": "tool_result",
+                "toolCallId": tool_call_id,
+                "result": f"Error cloning repository {repo_url}: {result}",
+            }
 
-        Returns:
-            handled: Whether the caller should suppress the original `response`.
-            event: The replacement event to emit (if any). When None and handled is True,
-                   the original response should be suppressed with no replacement.
-        """
-        try:
-            rtype = response.get("type")
-            if rtype == "tool_call" and response.get("toolName") in {"create_file", "edit_file"}:
-                tool_call_id = str(response.get("toolCallId") or "")
-                args = response.get("args") or {}
-                file_path = str(args.get("file_path") or args.get("path") or "")
-                if tool_call_id and file_path:
-                    self._pending_artifact_ops[tool_call_id] = {
-                        "file_path": file_path,
-                        "tool_name": response.get("toolName"),
-                        "content": args.get("content"),
-                    }
-                    return True, None
-
-            if rtype == "tool_result":
-                tool_call_id = str(response.get("toolCallId") or "")
-                pending = self._pending_artifact_ops.pop(tool_call_id, None)
-                if pending is not None:
-                    content = pending.get("content")
-                    if pending.get("tool_name") == "edit_file" and content is None:
-                        content = await self._read_file_content(pending.get("file_path", ""))
-
-                    artifact = self._extract_artifact_metadata(
-                        file_path=str(pending.get("file_path", "")),
-                        content_str=content,
-                    )
-                    if artifact is not None:
-                        evt_type = f"data-{artifact.get('artifact_type')}"
-                        return True, {"type": evt_type, "data": artifact}
-                    return True, None
-        except Exception as intercept_exc:
-            logger.debug(f"Artifact event interception failed: {intercept_exc}")
-        return False, None
+        logger.info(f"Successfully prepared repository {repo_url} with automation branch {automation_branch}")
+        return {
+            "type": "tool_result",
+            "toolCallId": tool_call_id,
+            "result": (
+                f"Repository {repo_url} successfully cloned to: {result} "
+                f"and automation branch '{automation_branch}' created"
+            ),
+        }
 
     def _is_filename_in_relevant_artifacts(self, filename: str) -> bool:
         """Check if filename exists in index.json relevantArtifacts array."""
         try:
             index_path = self.workspace_dir / "artifacts" / "index.json"
-            if not index_path.exists():
+            try:
+                stat = index_path.stat()
+            except FileNotFoundError:
                 return False
 
-            with open(index_path, encoding="utf-8") as f:
-                index_data = json.load(f)
+            # Only re-parse index.json when it has changed since the last lookup
+            cache = self._relevant_artifacts_cache
+            if cache is None or cache[0] != stat.st_mtime_ns or cache[1] != stat.st_size:
+                index_data = json.loads(index_path.read_bytes())
 
-            relevant_artifacts = index_data.get("relevantArtifacts", [])
-            for artifact in relevant_artifacts:
-                if artifact.get("filename") == filename:
-                    return True
+                relevant_filenames = frozenset(
+                    artifact.get("filename") for artifact in index_data.get("relevantArtifacts", [])
+                )
+                cache = (stat.st_mtime_ns, stat.st_size, relevant_filenames)
+                self._relevant_artifacts_cache = cache
 
-            return False
+            return filename in cache[2]
         except Exception as e:
             logger.warning(f"Failed to check filename in index.json: {e}")
             return False
@@ -237,8 +213,7 @@ class ApiTestingSuiteWorkflow(AgentWorkflow):
         if not normalized_path.startswith("artifacts/"):
             return None
 
-        path_obj = Path(normalized_path)
-        filename = path_obj.name
+        filename = os.path.basename(normalized_path)
         content_type = self._determine_content_type(filename)
 
         # Handle index.json file separately
@@ -266,7 +241,7 @@ class ApiTestingSuiteWorkflow(AgentWorkflow):
         artifact_type = "test"
 
         # Extract artifact ID from filename or content
-        artifact_id = path_obj.stem
+        artifact_id = os.path.splitext(filename)[0]
 
         # Handle content based on type - not all test files are JSON
         content = content_str
@@ -290,19 +265,10 @@ class ApiTestingSuiteWorkflow(AgentWorkflow):
 
     def _determine_content_type(self, filename: str) -> str:
         """Determine content type based on file extension."""
-        filename_lower = filename.lower()
-        if filename_lower.endswith((".json",)):
-            return "json"
-        elif filename_lower.endswith((".ts", ".spec.ts")):
-            return "typescript"
-        elif filename_lower.endswith((".js", ".spec.js")):
-            return "javascript"
-        elif filename_lower.endswith((".java",)):
-            return "java"
-        elif filename_lower.endswith((".py",)):
-            return "python"
-        else:
+        _, dot, extension = filename.rpartition(".")
+        if not dot:
             return "text"
+        return self._CONTENT_TYPES.get(extension.lower(), "text")
 
     async def run(self, *, session: UserAgentSession, messages: list[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
         """Run the API testing suite generation workflow."""
@@ -336,7 +302,8 @@ class ApiTestingSuiteWorkflow(AgentWorkflow):
                     if event is not None:
                         yield event
                         logger.info(
-                            f"Artifact event emitted after tool_result: {event.get('type')}",
+                            "Artifact event emitted after tool_result: {}",
+                            event.get("type"),
                             extra={"artifact": (event.get("data") or {}).get("artifact_id")},
                         )
                     continue
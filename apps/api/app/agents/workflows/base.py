@@ -1,19 +1,27 @@
 """Base protocol for agent workflow implementations."""
 
+import asyncio
+import contextlib
+import posixpath
 import shutil
 from abc import ABC, abstractmethod
-from collections.abc import AsyncIterator
+from collections.abc import AsyncGenerator, AsyncIterator
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 from loguru import logger
 
 from app.agents.claude.orchestrator import ClaudeOrchestrator
 from app.agents.enums import AgentIdentifier
 from app.core.template_renderer import create_agent_renderer
+from app.integrations import token_cache
+from app.integrations.enums import IntegrationProvider
 from app.models.user_agent_session import UserAgentSession
 from app.services.integration_service import IntegrationService
 
+# Marks the end of a prefetched stream in AgentWorkflow._prefetch
+_PREFETCH_DONE = object()
+
 
 class AgentWorkflow(ABC):
     """
@@ -26,6 +34,24 @@ class AgentWorkflow(ABC):
     # Subclasses should set this to the appropriate AgentIdentifier (e.g., AgentIdentifier.CODE_ANALYSIS)
     identifier: AgentIdentifier | None = None
 
+    # Mapped tool names whose results are intercepted as artifact events
+    _FILE_OP_TOOLS: ClassVar[frozenset[str]] = frozenset({"create_file", "edit_file"})
+
+    # Workspace folder artifacts are written under, and the suffix artifact files must have ("" accepts any file)
+    _ARTIFACT_DIR: ClassVar[str] = "artifacts"
+    _ARTIFACT_SUFFIX: ClassVar[str] = ""
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Compile the subclass's prompt templates once, when the workflow class is defined."""
+        super().__init_subclass__(**kwargs)
+        if cls.identifier is None:
+            return
+        try:
+            create_agent_renderer().precompile(f"{cls.identifier.value}/")
+        except Exception as exc:
+            # A broken template should only fail its own workflow at render time, not app import
+            logger.warning(f"Failed to precompile templates for {cls.identifier.value}: {exc}")
+
     def __init__(
         self,
         *,
@@ -51,6 +77,16 @@ class AgentWorkflow(ABC):
         self.user_dir = self.workspace_dir.parent.parent
         self.files_dir = self.user_dir / "files"
 
+        # Resolved once: _relativize_to_workspace runs for every file tool event
+        self._resolved_workspace = self.workspace_dir.resolve()
+        self._workspace_prefixes = tuple(
+            dict.fromkeys(f"{path.as_posix()}/" for path in (self.workspace_dir, self._resolved_workspace))
+        )
+
+        # Track file-op tool calls until their corresponding tool_result arrives: id -> (file_path, tool_name, content).
+        # Keyed by id since one assistant message can issue several file-op tool calls before any result arrives.
+        self._pending_artifact_ops: dict[str, tuple[str, str, Any]] = {}
+
     def _create_orchestrator(self) -> ClaudeOrchestrator:
         """Create the orchestrator for the agent workflow."""
         return ClaudeOrchestrator(
@@ -60,18 +96,22 @@ class AgentWorkflow(ABC):
             resume_session_id=self.llm_session_id,
         )
 
-    async def _build_context(self, *, session: UserAgentSession, **extra: Any) -> dict[str, Any]:
+    def _build_context(self, *, session: UserAgentSession, **extra: Any) -> dict[str, Any]:
         """Construct rendering context from session data."""
-        # Merge mcps and custom_properties into a single context object
-        custom_properties: dict[str, Any] = session.custom_properties or {}
-        return {"mcps": session.mcps or [], **custom_properties, **extra}
+        # Merge mcps, custom_properties and extra in place into a single context object
+        context: dict[str, Any] = {"mcps": session.mcps or []}
+        if session.custom_properties:
+            context.update(session.custom_properties)
+        if extra:
+            context.update(extra)
+        return context
 
     async def _prepare_system_prompt(self, *, session: UserAgentSession, **extra: Any) -> str:
         """
         Default Jinja2-based system prompt renderer.
         Looks for `app/agents/templates/<identifier>/system.md`.
         """
-        context = await self._build_context(session=session, **extra)
+        context = self._build_context(session=session, **extra)
 
         return await self.prompt_renderer.render(
             template_name=f"{self.identifier.value}/system.md",  # type: ignore
@@ -80,7 +120,7 @@ class AgentWorkflow(ABC):
 
     async def _prepare_user_prompt(self, *, session: UserAgentSession, **extra: Any) -> str:
         """Render user prompt for initial test generation from template."""
-        context = await self._build_context(session=session, **extra)
+        context = self._build_context(session=session, **extra)
         try:
             return await self.prompt_renderer.render(
                 template_name=f"{self.identifier.value}/user.md",  # type: ignore
@@ -92,8 +132,8 @@ class AgentWorkflow(ABC):
 
     async def _prepare_user_followup_prompt(self, *, session: UserAgentSession, feedback: str, **extra: Any) -> str:
         """Render user followup prompt for test case generation from template."""
-        extra.update({"user_feedback": feedback})
-        context = await self._build_context(session=session, **extra)
+        extra["user_feedback"] = feedback
+        context = self._build_context(session=session, **extra)
         return await self.prompt_renderer.render(
             template_name=f"{self.identifier.value}/user_followup.md",  # type: ignore
             context=context,
@@ -144,18 +184,103 @@ class AgentWorkflow(ABC):
         ...
 
     # helper methods
+    @classmethod
+    def _is_artifact_candidate(cls, file_path: str) -> bool:
+        """Return whether a path could hold an artifact, without touching the filesystem."""
+        return cls._ARTIFACT_DIR in file_path and file_path.endswith(cls._ARTIFACT_SUFFIX)
+
+    def _extract_artifact_metadata(self, *, file_path: str, content_str: Any) -> dict[str, Any] | None:
+        """Classify a written file as an artifact; workflows that emit artifacts override this."""
+        return None
+
+    async def _maybe_intercept_artifact_event(self, response: dict[str, Any]) -> tuple[bool, dict[str, Any] | None]:
+        """Intercept file operation tool events and emit normalized artifact events.
+
+        Returns:
+            handled: Whether the caller should suppress the original `response`.
+            event: The replacement event to emit (if any). When None and handled is True,
+                   the original response should be suppressed with no replacement.
+        """
+        # Most streamed events are text/thinking; reject them before any further lookups
+        get = response.get
+        rtype = get("type")
+        if rtype != "tool_call" and rtype != "tool_result":
+            return False, None
+
+        try:
+            if rtype == "tool_call":
+                tool_name = get("toolName")
+                if tool_name in self._FILE_OP_TOOLS:
+                    tool_call_id = get("toolCallId") or ""
+                    args = get("args") or {}
+                    args_get = args.get
+                    file_path = str(args_get("file_path") or args_get("path") or "")
+                    if tool_call_id and file_path:
+                        self._pending_artifact_ops[tool_call_id] = (file_path, tool_name, args_get("content"))
+                        return True, None
+            elif rtype == "tool_result":
+                tool_call_id = get("toolCallId") or ""
+                pending = self._pending_artifact_ops.pop(tool_call_id, None)
+                if pending is not None:
+                    file_path, tool_name, content = pending
+                    # Skip the disk read and JSON parse for files that cannot be artifacts
+                    if not self._is_artifact_candidate(file_path):
+                        return True, None
+                    if tool_name == "edit_file" and content is None:
+                        content = await self._read_file_content(file_path)
+
+                    artifact = self._extract_artifact_metadata(
+                        file_path=file_path,
+                        content_str=content,
+                    )
+                    if artifact is not None:
+                        evt_type = f"data-{artifact.get('artifact_type')}"
+                        return True, {"type": evt_type, "data": artifact}
+                    return True, None
+        except Exception as intercept_exc:
+            logger.debug(f"Artifact event interception failed: {intercept_exc}")
+        return False, None
+
+    async def _get_github_token(self) -> str | None:
+        """Get the GitHub token for the session's user.
+
+        Tokens are cached in-process for a short TTL so repeated runs skip the
+        integration lookup and token generation round-trips.
+        """
+        user_id = self.integration_service.crud.user_id
+        cached = token_cache.get_github_token(user_id)
+        if cached is not None:
+            return cached
+
+        integration = await self.integration_service.crud.get_by_provider(provider=IntegrationProvider.GITHUB)
+        if not integration:
+            return None
+        token = await self.integration_service.get_access_token(integration_id=integration.id)  # type: ignore
+        if token:
+            token_cache.set_github_token(user_id, token)
+        return token
+
+    def _invalidate_github_token(self) -> None:
+        """Drop the cached GitHub token for the session's user (e.g., after an auth failure)."""
+        token_cache.invalidate_github_token(self.integration_service.crud.user_id)
+
     def _relativize_to_workspace(self, path_str: str | Path, anchor: str) -> str:
         """Return a POSIX-style path relative to the workflow workspace.
 
         Falls back to searching for anchor segment (e.g., "tests/" or "docs/")
         if normal relativization fails.
         """
+        # Fast path: absolute paths under the workspace need only string normalization, no syscalls
+        normalized = posixpath.normpath(str(path_str))
+        for prefix in self._workspace_prefixes:
+            if normalized.startswith(prefix):
+                return normalized[len(prefix) :]
+
         try:
             abs_path = Path(path_str) if isinstance(path_str, str) else path_str
-            ws = self.workspace_dir
-            return abs_path.resolve().relative_to(ws.resolve()).as_posix()
+            return abs_path.resolve().relative_to(self._resolved_workspace).as_posix()
         except Exception:
-            s = str(path_str).replace("\\", "/")
+            s = normalized.replace("\\", "/")
             # Prefer trimming to anchor segment if present
             idx = s.find(anchor)
             if idx != -1:
@@ -178,12 +303,11 @@ class AgentWorkflow(ABC):
             else:
                 full_path = self.workspace_dir / file_path
 
-            # Check if file exists and read content
-            if full_path.exists() and full_path.is_file():
-                return full_path.read_text(encoding="utf-8")
-            else:
+            # Check if file exists and read content off the event loop
+            content = await asyncio.to_thread(self._read_text_if_file, full_path)
+            if content is None:
                 logger.warning(f"File not found for edit operation: {full_path}")
-                return None
+            return content
 
         except Exception as exc:
             logger.warning(f"Failed to read file content for edit operation: {file_path}. Error: {exc}")
@@ -195,15 +319,92 @@ class AgentWorkflow(ABC):
         Args:
             file_name: Name of the file to copy
         """
-        try:
-            source_file = self.files_dir / file_name
+        await self._copy_files_to_workspace([file_name])
+
+    async def _copy_files_to_workspace(self, file_names: list[str]) -> None:
+        """Copy files from user's file storage to the workspace root.
 
-            if source_file.exists() and source_file.is_file():
-                # Copy to workspace root for easy access
-                target_file = self.workspace_dir / file_name
-                shutil.copy2(source_file, target_file)
+        All stats and copies run in a single worker-thread task; failures are logged per file.
+
+        Args:
+            file_names: Names of the files to copy
+        """
+        if not file_names:
+            return
+        pairs = [(self.files_dir / file_name, self.workspace_dir / file_name) for file_name in file_names]
+        outcomes = await asyncio.to_thread(self._copy_many_if_file, pairs)
+        for file_name, outcome in zip(file_names, outcomes, strict=True):
+            if isinstance(outcome, Exception):
+                logger.warning(f"Failed to copy file {file_name}: {outcome}", extra={"file": file_name})
+            elif outcome:
                 logger.info(f"Copied file {file_name} from user storage to workspace", extra={"file": file_name})
             else:
                 logger.warning(f"File {file_name} not found in user file storage", extra={"file": file_name})
-        except Exception as e:
-            logger.warning(f"Failed to copy file {file_name}: {e}", extra={"file": file_name})
+
+    @staticmethod
+    async def _prefetch(source: AsyncGenerator[Any, None], size: int = 16) -> AsyncIterator[Any]:
+        """
+        Relay `source` through a bounded queue filled by a background task.
+
+        Lets the producer (e.g. the Claude stream) pull its next events while the consumer
+        is still writing the previous ones to the client. Producer errors are re-raised here;
+        closing the relay early cancels the producer, which closes `source` in its own task.
+        """
+        queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=size)
+
+        async def _produce() -> None:
+            async with contextlib.aclosing(source):
+                try:
+                    async for item in source:
+                        await queue.put(item)
+                finally:
+                    # Unblock the consumer on errors too; skipped on cancellation since nobody is reading
+                    if not asyncio.current_task().cancelling():  # type: ignore[union-attr]
+                        await queue.put(_PREFETCH_DONE)
+
+        producer = asyncio.create_task(_produce())
+        try:
+            while (item := await queue.get()) is not _PREFETCH_DONE:
+                yield item
+            await producer  # re-raises a producer failure
+        finally:
+            if not producer.done():
+                producer.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await producer
+
+    async def _make_dirs(self, *dirs: Path) -> None:
+        """Create directories (with parents) in a single worker-thread hop."""
+        await asyncio.to_thread(self._make_dirs_blocking, dirs)
+
+    @staticmethod
+    def _make_dirs_blocking(dirs: tuple[Path, ...]) -> None:
+        """Blocking mkdir -p used via asyncio.to_thread."""
+        for directory in dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _read_text_if_file(path: Path) -> str | None:
+        """Blocking read used via asyncio.to_thread; returns None when path is not a file."""
+        if not path.is_file():
+            return None
+        return path.read_text(encoding="utf-8")
+
+    @staticmethod
+    def _copy_if_file(source: Path, target: Path) -> bool:
+        """Blocking copy used via asyncio.to_thread; returns False when source is not a file."""
+        if not source.is_file():
+            return False
+        shutil.copy2(source, target)
+        return True
+
+    @classmethod
+    def _copy_many_if_file(cls, pairs: list[tuple[Path, Path]]) -> list[bool | Exception]:
+        """Blocking batch copy used via asyncio.to_thread; captures per-file errors instead of raising."""
+        outcomes: list[bool | Exception] = []
+        for source, target in pairs:
+            try:
+                outcomes.append(cls._copy_if_file(source, target))
+            except Exception as exc:
+                outcomes.append(exc)
+        return outcomes
@@ -1,9 +1,9 @@
 """Code documentation agent workflow implementation."""
 
+import contextlib
 from collections.abc import AsyncIterator
 from pathlib import Path
-from typing import Any
-from urllib.parse import urlparse
+from typing import Any, ClassVar
 
 from loguru import logger
 
@@ -11,9 +11,9 @@ from app.agents.enums import AgentIdentifier
 from app.agents.git.ops import GitOperationError, GitOps
 from app.agents.workflows.base import AgentWorkflow
 from app.agents.workflows.factory import register
-from app.integrations.enums import IntegrationProvider
 from app.models.user_agent_session import UserAgentSession
 from app.services.integration_service import IntegrationService
+from app.utils.helpers import is_github_url, stable_digest
 
 
 @register(AgentIdentifier.CODE_ANALYSIS)
@@ -23,6 +23,9 @@ class CodeAnalysisWorkflow(AgentWorkflow):
     # Used by base to select templates folder: app/agents/templates/code_analysis/*
     identifier = AgentIdentifier.CODE_ANALYSIS
 
+    # The followup system prompt has no context, so it is rendered once per process
+    _followup_system_prompt: ClassVar[str | None] = None
+
     def __init__(
         self,
         *,
@@ -42,19 +45,15 @@ class CodeAnalysisWorkflow(AgentWorkflow):
         )
         self.git_ops = GitOps()
 
-    async def _get_github_token(self) -> str | None:
-        """Get the GitHub token for the session."""
-        integration = await self.integration_service.crud.get_by_provider(provider=IntegrationProvider.GITHUB)
-        if integration:
-            return await self.integration_service.get_access_token(integration_id=integration.id)  # type: ignore
-        return None
-
     async def _prepare_followup_system_prompt(self) -> str:
         """Prepare the followup system prompt for the code documentation workflow."""
-        return await self.prompt_renderer.render(
-            template_name=f"{self.identifier.value}/system_followup.md",
-            context={},
-        )
+        cls = type(self)
+        if cls._followup_system_prompt is None:
+            cls._followup_system_prompt = await self.prompt_renderer.render(
+                template_name=f"{self.identifier.value}/system_followup.md",
+                context={},
+            )
+        return cls._followup_system_prompt
 
     async def _prepare_system_prompt(self, session: UserAgentSession, **extra: Any) -> str:
         """
@@ -70,12 +69,6 @@ class CodeAnalysisWorkflow(AgentWorkflow):
         self, *, session: UserAgentSession, messages: list[dict[str, Any]]
     ) -> AsyncIterator[dict[str, Any]]:
         """Prepare workspace for code documentation by cloning repositories."""
-        # check if session already exists
-        if session.llm_session_id:
-            logger.info(f"Session {session.id} already has an LLM session ID: {session.llm_session_id}")
-            logger.info("Skipping prepare and running directly")
-
-            return
         logger.info(f"Preparing workspace {self.workspace_dir} for code documentation")
 
         # Extract repository URLs from messages'
@@ -88,21 +81,22 @@ class CodeAnalysisWorkflow(AgentWorkflow):
 
         try:
             repos_dir = self.workspace_dir
-            repos_dir.mkdir(parents=True, exist_ok=True)
+            await self._make_dirs(repos_dir)
 
             # Resolve provider tokens once per host (V1: only GitHub)
             github_token: str | None = await self._get_github_token()
 
-            # Clone each repository
+            # Emit each clone's tool call up front; entries without a URL are skipped and duplicates cloned once
+            clones: dict[str, tuple[str, str]] = {}
             for repo_data in repo_urls:
                 repo_url = repo_data.get("url")
-                repo_branch = repo_data.get("branch", "main")
-                logger.info(f"Cloning repository: {repo_url}")
-                host = urlparse(repo_url).netloc.lower()
-                access_token = github_token if "github.com" in host else None
-
-                tool_call_id = f"git_clone_{hash(str(repo_url))}"
-                # Git clone operations
+                if not repo_url:
+                    logger.warning(f"Skipping repository entry without a url: {repo_data}")
+                    continue
+                if repo_url in clones:
+                    continue
+                tool_call_id = f"git_clone_{stable_digest(repo_url)}"
+                clones[repo_url] = (tool_call_id, repo_data.get("branch", "main"))
                 yield {
                     "type": "tool_call",
                     "toolCallId": tool_call_id,
@@ -112,22 +106,35 @@ class CodeAnalysisWorkflow(AgentWorkflow):
                         "prompt": f"Cloning repository {repo_url}...",
                     },
                 }
-                # Add
-                await self.git_ops.clone_repository(
-                    url=repo_url,
-                    destination_dir=repos_dir,
-                    branch=repo_branch,
-                    access_token=access_token,
-                )
-                yield {
-                    "type": "tool_result",
-                    "toolCallId": tool_call_id,
-                    "result": f"Repository {repo_url} successfully cloned to: {repos_dir}/{repo_url.split('/')[-1]}",
-                }
 
-            logger.info(f"Successfully cloned {len(repo_urls)} repositories into {repos_dir}")
+            # Clone concurrently and report each result as soon as its clone finishes
+            repos = list(clones.items())
+            specs = [
+                {
+                    "url": repo_url,
+                    "destination_dir": repos_dir,
+                    "branch": repo_branch,
+                    "access_token": github_token if is_github_url(repo_url) else None,
+                }
+                for repo_url, (_, repo_branch) in repos
+            ]
+            # aclosing cancels outstanding clones if one fails or the consumer goes away
+            async with contextlib.aclosing(self.git_ops.clone_many(specs)) as results:
+                async for index, result in results:
+                    if isinstance(result, Exception):
+                        raise result
+                    repo_url, (tool_call_id, _) = repos[index]
+                    yield {
+                        "type": "tool_result",
+                        "toolCallId": tool_call_id,
+                        "result": f"Repository {repo_url} successfully cloned to: {result}",
+                    }
+
+            logger.info(f"Successfully cloned {len(clones)} repositories into {repos_dir}")
 
         except GitOperationError as e:
+            # The cached token may have been revoked or rotated; refetch it next time
+            self._invalidate_github_token()
             logger.error(f"Failed to clone repositories: {e}")
             raise
         except Exception as e:
@@ -139,9 +146,10 @@ class CodeAnalysisWorkflow(AgentWorkflow):
         try:
             logger.info("Starting code documentation workflow")
 
-            # call prepare
-            async for event in self.prepare(session=session, messages=messages):
-                yield event
+            # Continuing sessions already have a prepared workspace; skip prepare() without creating it
+            if not session.llm_session_id:
+                async for event in self.prepare(session=session, messages=messages):
+                    yield event
 
             system_prompt = await self._prepare_system_prompt(session=session)
 
@@ -151,7 +159,7 @@ class CodeAnalysisWorkflow(AgentWorkflow):
 
             # Stream responses from Claude Code SDK directly
             logger.info(f"Invoking Claude Code SDK with system prompt: {system_prompt}")
-            async for response in self.orchestrator.run(messages, system_prompt=system_prompt):
+            async for response in self._prefetch(self.orchestrator.run(messages, system_prompt=system_prompt)):
                 yield response
             logger.info("Claude Code SDK invocation completed")
 
@@ -1,8 +1,7 @@
 """Code reviewer agent workflow implementation."""
 
 from collections.abc import AsyncIterator
-from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 from loguru import logger
 
@@ -10,7 +9,6 @@ from app.agents.enums import AgentIdentifier
 from app.agents.workflows.base import AgentWorkflow
 from app.agents.workflows.factory import register
 from app.models.user_agent_session import UserAgentSession
-from app.services.integration_service import IntegrationService
 from app.utils.helpers import try_parse_json_content
 
 
@@ -20,25 +18,9 @@ class CodeReviewerWorkflow(AgentWorkflow):
 
     identifier = AgentIdentifier.CODE_REVIEWER
 
-    def __init__(
-        self,
-        *,
-        workspace_dir: Path,
-        mcp_configs: dict[str, Any],
-        integration_service: IntegrationService,
-        system_prompt: str | None = None,
-        llm_session_id: str | None = None,
-    ) -> None:
-        """Initialize workflow with required parameters and renderer."""
-        super().__init__(
-            workspace_dir=workspace_dir,
-            mcp_configs=mcp_configs,
-            integration_service=integration_service,
-            system_prompt=system_prompt,
-            llm_session_id=llm_session_id,
-        )
-        # Track file-op tool calls until their corresponding tool_result arrives
-        self._pending_artifact_ops: dict[str, dict[str, Any]] = {}
+    # Review artifact filenames mapped to their artifact type (also used as artifact id)
+    _ARTIFACT_FILES: ClassVar[dict[str, str]] = {"index.json": "index", "comments.json": "comments"}
+    _ARTIFACT_SUFFIX = ".json"
 
     async def prepare(
         self, *, session: UserAgentSession, messages: list[dict[str, Any]]
@@ -51,7 +33,7 @@ class CodeReviewerWorkflow(AgentWorkflow):
 
         try:
             artifacts_dir = self.workspace_dir / "artifacts"
-            artifacts_dir.mkdir(parents=True, exist_ok=True)
+            await self._make_dirs(artifacts_dir)
 
             logger.info("Workspace prepared for code review outputs", extra={"artifacts_dir": str(artifacts_dir)})
         except Exception as exc:
@@ -61,48 +43,6 @@ class CodeReviewerWorkflow(AgentWorkflow):
         for _ in ():
             yield {}
 
-    async def _maybe_intercept_artifact_event(self, response: dict[str, Any]) -> tuple[bool, dict[str, Any] | None]:
-        """Intercept file operation tool events and emit normalized artifact events.
-
-        Returns:
-            handled: Whether the caller should suppress the original `response`.
-            event: The replacement event to emit (if any). When None and handled is True,
-                   the original response should be suppressed with no replacement.
-        """
-        try:
-            rtype = response.get("type")
-            if rtype == "tool_call" and response.get("toolName") in {"create_file", "edit_file"}:
-                tool_call_id = str(response.get("toolCallId") or "")
-                args = response.get("args") or {}
-                file_path = str(args.get("file_path") or args.get("path") or "")
-                if tool_call_id and file_path:
-                    self._pending_artifact_ops[tool_call_id] = {
-                        "file_path": file_path,
-                        "tool_name": response.get("toolName"),
-                        "content": args.get("content"),
-                    }
-                    return True, None
-
-            if rtype == "tool_result":
-                tool_call_id = str(response.get("toolCallId") or "")
-                pending = self._pending_artifact_ops.pop(tool_call_id, None)
-                if pending is not None:
-                    content = pending.get("content")
-                    if pending.get("tool_name") == "edit_file" and content is None:
-                        content = await self._read_file_content(pending.get("file_path", ""))
-
-                    artifact = self._extract_artifact_metadata(
-                        file_path=str(pending.get("file_path", "")),
-                        content_str=content,
-                    )
-                    if artifact is not None:
-                        evt_type = f"data-{artifact.get('artifact_type')}"
-                        return True, {"type": evt_type, "data": artifact}
-                    return True, None
-        except Exception as intercept_exc:
-            logger.debug(f"Artifact event interception failed: {intercept_exc}")
-        return False, None
-
     async def run(self, *, session: UserAgentSession, messages: list[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
         """Run the code review workflow."""
         try:
@@ -135,7 +75,8 @@ class CodeReviewerWorkflow(AgentWorkflow):
                     if event is not None:
                         yield event
                         logger.info(
-                            f"Artifact event emitted after tool_result: {event.get('type')}",
+                            "Artifact event emitted after tool_result: {}",
+                            event.get("type"),
                             extra={"artifact": (event.get("data") or {}).get("artifact_id")},
                         )
                     continue
@@ -172,12 +113,10 @@ class CodeReviewerWorkflow(AgentWorkflow):
         if not normalized_path.startswith("artifacts/"):
             return None
 
-        path_obj = Path(normalized_path)
-        filename = path_obj.name
-        content_type = "json" if filename.endswith(".json") else "md"
-
-        # Only handle JSON files in artifacts directory
-        if not filename.endswith(".json"):
+        # Only index.json and comments.json are artifacts; both share their type and id with the filename stem
+        filename = normalized_path.rpartition("/")[2]
+        artifact_type = self._ARTIFACT_FILES.get(filename)
+        if artifact_type is None:
             return None
 
         parsed_content = try_parse_json_content(content_str)
@@ -185,27 +124,13 @@ class CodeReviewerWorkflow(AgentWorkflow):
             logger.warning(f"Failed to parse JSON content from {file_path}")
             return None
 
-        # Determine artifact type based on filename
-        artifact_type = None
-        artifact_id = None
-
-        if filename == "index.json":
-            artifact_type = "index"
-            artifact_id = "index"
-        elif filename == "comments.json":
-            artifact_type = "comments"
-            artifact_id = "comments"
-        else:
-            # Return None for unrecognized files
-            return None
-
         artifact = {
             "artifact_type": artifact_type,
             "actual_file_path": file_path,
             "file_path": normalized_path,
             "filename": filename,
-            "content_type": content_type,
-            "artifact_id": artifact_id,
+            "content_type": "json",
+            "artifact_id": artifact_type,
             "content": parsed_content,
         }
         return artifact
@@ -20,6 +20,8 @@ class WorkflowFactory:
     Based on backend-technical-design.md section: Agent Workflows (Claude Code Wrapper)
     """
 
+    __slots__ = ("_workflows",)
+
     def __init__(self) -> None:
         self._workflows: dict[AgentIdentifier, type[AgentWorkflow]] = {}
 
@@ -1,8 +1,7 @@
 """Requirements to tickets agent workflow implementation."""
 
 from collections.abc import AsyncIterator
-from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
 from loguru import logger
 
@@ -10,7 +9,6 @@ from app.agents.enums import AgentIdentifier
 from app.agents.workflows.base import AgentWorkflow
 from app.agents.workflows.factory import register
 from app.models.user_agent_session import UserAgentSession
-from app.services.integration_service import IntegrationService
 from app.utils.helpers import try_parse_json_content
 
 
@@ -20,25 +18,9 @@ class RequirementsToTicketsWorkflow(AgentWorkflow):
 
     identifier = AgentIdentifier.REQUIREMENTS_TO_TICKETS
 
-    def __init__(
-        self,
-        *,
-        workspace_dir: Path,
-        mcp_configs: dict[str, Any],
-        integration_service: IntegrationService,
-        system_prompt: str | None = None,
-        llm_session_id: str | None = None,
-    ) -> None:
-        """Initialize workflow with required parameters and renderer."""
-        super().__init__(
-            workspace_dir=workspace_dir,
-            mcp_configs=mcp_configs,
-            integration_service=integration_service,
-            system_prompt=system_prompt,
-            llm_session_id=llm_session_id,
-        )
-        # Track file-op tool calls until their corresponding tool_result arrives
-        self._pending_artifact_ops: dict[str, dict[str, Any]] = {}
+    # Ticket subdirectories under artifacts/ mapped to the artifact type they hold
+    _TICKET_DIRS: ClassVar[dict[str, str]] = {"epics": "epic", "stories": "story", "tasks": "task"}
+    _ARTIFACT_SUFFIX = ".json"
 
     async def prepare(
         self, *, session: UserAgentSession, messages: list[dict[str, Any]]
@@ -52,12 +34,9 @@ class RequirementsToTicketsWorkflow(AgentWorkflow):
 
         try:
             artifacts_dir = self.workspace_dir / "artifacts"
-            artifacts_dir.mkdir(parents=True, exist_ok=True)
 
-            # Create subdirectories for each ticket type
-            (artifacts_dir / "epics").mkdir(parents=True, exist_ok=True)
-            (artifacts_dir / "stories").mkdir(parents=True, exist_ok=True)
-            (artifacts_dir / "tasks").mkdir(parents=True, exist_ok=True)
+            # Create subdirectories for each ticket type (parents included)
+            await self._make_dirs(artifacts_dir / "epics", artifacts_dir / "stories", artifacts_dir / "tasks")
 
             logger.info("Workspace prepared for filesystem outputs", extra={"artifacts_dir": str(artifacts_dir)})
         except Exception as exc:
@@ -67,48 +46,6 @@ class RequirementsToTicketsWorkflow(AgentWorkflow):
         for _ in ():
             yield {}
 
-    async def _maybe_intercept_artifact_event(self, response: dict[str, Any]) -> tuple[bool, dict[str, Any] | None]:
-        """Intercept file operation tool events and emit normalized artifact events.
-
-        Returns:
-            handled: Whether the caller should suppress the original `response`.
-            event: The replacement event to emit (if any). When None and handled is True,
-                   the original response should be suppressed with no replacement.
-        """
-        try:
-            rtype = response.get("type")
-            if rtype == "tool_call" and response.get("toolName") in {"create_file", "edit_file"}:
-                tool_call_id = str(response.get("toolCallId") or "")
-                args = response.get("args") or {}
-                file_path = str(args.get("file_path") or args.get("path") or "")
-                if tool_call_id and file_path:
-                    self._pending_artifact_ops[tool_call_id] = {
-                        "file_path": file_path,
-                        "tool_name": response.get("toolName"),
-                        "content": args.get("content"),
-                    }
-                    return True, None
-
-            if rtype == "tool_result":
-                tool_call_id = str(response.get("toolCallId") or "")
-                pending = self._pending_artifact_ops.pop(tool_call_id, None)
-                if pending is not None:
-                    content = pending.get("content")
-                    if pending.get("tool_name") == "edit_file" and content is None:
-                        content = await self._read_file_content(pending.get("file_path", ""))
-
-                    artifact = self._extract_artifact_metadata(
-                        file_path=str(pending.get("file_path", "")),
-                        content_str=content,
-                    )
-                    if artifact is not None:
-                        evt_type = f"data-{artifact.get('artifact_type')}"
-                        return True, {"type": evt_type, "data": artifact}
-                    return True, None
-        except Exception as intercept_exc:
-            logger.debug(f"Artifact event interception failed: {intercept_exc}")
-        return False, None
-
     async def run(self, *, session: UserAgentSession, messages: list[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
         """Run the requirements to tickets conversion workflow."""
         try:
@@ -141,7 +78,8 @@ class RequirementsToTicketsWorkflow(AgentWorkflow):
                     if event is not None:
                         yield event
                         logger.info(
-                            f"Artifact event emitted after tool_result: {event.get('type')}",
+                            "Artifact event emitted after tool_result: {}",
+                            event.get("type"),
                             extra={"artifact": (event.get("data") or {}).get("artifact_id")},
                         )
                     continue
@@ -178,10 +116,9 @@ class RequirementsToTicketsWorkflow(AgentWorkflow):
         if not normalized_path.startswith("artifacts/"):
             return None
 
-        path_obj = Path(normalized_path)
-        filename = path_obj.name
-        parent_dir = path_obj.parent.name
-        content_type = "json" if filename.endswith(".json") else "md"
+        # Split off filename and parent directory name with plain string ops (no Path objects)
+        parent_path, _, filename = normalized_path.rpartition("/")
+        parent_dir = parent_path.rpartition("/")[2]
 
         # Handle index.json file separately
         if filename == "index.json":
@@ -195,21 +132,15 @@ class RequirementsToTicketsWorkflow(AgentWorkflow):
                 "actual_file_path": file_path,
                 "file_path": normalized_path,
                 "filename": filename,
-                "content_type": content_type,
+                "content_type": "json",
                 "artifact_id": "index",
                 "content": parsed_content,
             }
             return artifact
 
         # Determine artifact type based on parent directory
-        artifact_type = None
-        if parent_dir == "epics":
-            artifact_type = "epic"
-        elif parent_dir == "stories":
-            artifact_type = "story"
-        elif parent_dir == "tasks":
-            artifact_type = "task"
-        else:
+        artifact_type = self._TICKET_DIRS.get(parent_dir)
+        if artifact_type is None:
             return None
 
         parsed_content = try_parse_json_content(content_str)
@@ -218,7 +149,7 @@ class RequirementsToTicketsWorkflow(AgentWorkflow):
             return None
 
         # Extract artifact ID from filename or content
-        artifact_id = path_obj.stem
+        artifact_id = filename.rpartition(".")[0] or filename
         if isinstance(parsed_content, dict) and "id" in parsed_content:
             artifact_id = parsed_content["id"]
 
@@ -227,7 +158,7 @@ class RequirementsToTicketsWorkflow(AgentWorkflow):
             "actual_file_path": file_path,
             "file_path": normalized_path,
             "filename": filename,
-            "content_type": content_type,
+            "content_type": "json",
             "artifact_id": artifact_id,
             "content": parsed_content,
         }
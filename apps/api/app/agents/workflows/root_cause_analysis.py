@@ -1,14 +1,12 @@
 """Root Cause Analysis agent workflow implementation."""
 
 from collections.abc import AsyncIterator
-from pathlib import Path
 from typing import Any
 
 from app.agents.enums import AgentIdentifier
 from app.agents.workflows.base import AgentWorkflow
 from app.agents.workflows.factory import register
 from app.models.user_agent_session import UserAgentSession
-from app.services.integration_service import IntegrationService
 from app.utils.helpers import try_parse_json_content
 from app.utils.logger import get_logger
 
@@ -22,25 +20,8 @@ class RootCauseAnalysisWorkflow(AgentWorkflow):
     # Used by base to select templates folder: app/agents/templates/root_cause_analysis/*
     identifier = AgentIdentifier.ROOT_CAUSE_ANALYSIS
 
-    def __init__(
-        self,
-        *,
-        workspace_dir: Path,
-        mcp_configs: dict[Any, Any],
-        integration_service: IntegrationService,
-        system_prompt: str | None = None,
-        llm_session_id: str | None = None,
-    ) -> None:
-        """Initialize workflow with required parameters."""
-        super().__init__(
-            workspace_dir=workspace_dir,
-            mcp_configs=mcp_configs,
-            integration_service=integration_service,
-            system_prompt=system_prompt,
-            llm_session_id=llm_session_id,
-        )
-        # Track file-op tool calls until their corresponding tool_result arrives
-        self._pending_artifact_ops: dict[str, dict[str, Any]] = {}
+    # RCA artifacts are JSON files under artifacts/
+    _ARTIFACT_SUFFIX = ".json"
 
     async def _prepare_system_prompt(self, *, session: UserAgentSession, **extra: Any) -> str:
         """
@@ -53,12 +34,6 @@ class RootCauseAnalysisWorkflow(AgentWorkflow):
         self, *, session: UserAgentSession, messages: list[dict[str, Any]]
     ) -> AsyncIterator[dict[str, Any]]:
         """Prepare workspace for RCA by setting up integrations and collecting data sources."""
-        # Check if session already exists
-        if session.llm_session_id:
-            logger.info(f"Session {session.id} already has an LLM session ID: {session.llm_session_id}")
-            logger.info("Skipping prepare and running directly")
-            return
-
         logger.info(f"Preparing workspace {self.workspace_dir} for root cause analysis")
 
         # Extract incident and related data from session properties
@@ -75,9 +50,8 @@ class RootCauseAnalysisWorkflow(AgentWorkflow):
         try:
             # Create workspace directory structure for RCA artifacts
             rca_dir = self.workspace_dir / "artifacts"
-            rca_dir.mkdir(parents=True, exist_ok=True)
             solutions_dir = rca_dir / "solutions"
-            solutions_dir.mkdir(parents=True, exist_ok=True)
+            await self._make_dirs(solutions_dir)
 
             # Yield preparation events
             yield {
@@ -115,56 +89,15 @@ class RootCauseAnalysisWorkflow(AgentWorkflow):
             logger.error(f"Failed to prepare RCA workspace: {e}")
             raise
 
-    async def _maybe_intercept_artifact_event(self, response: dict[str, Any]) -> tuple[bool, dict[str, Any] | None]:
-        """Intercept file operation tool events and emit normalized artifact events.
-
-        Returns:
-            handled: Whether the caller should suppress the original `response`.
-            event: The replacement event to emit (if any). When None and handled is True,
-                   the original response should be suppressed with no replacement.
-        """
-        try:
-            rtype = response.get("type")
-            if rtype == "tool_call" and response.get("toolName") in {"create_file", "edit_file"}:
-                tool_call_id = str(response.get("toolCallId") or "")
-                args = response.get("args") or {}
-                file_path = str(args.get("file_path") or args.get("path") or "")
-                if tool_call_id and file_path:
-                    self._pending_artifact_ops[tool_call_id] = {
-                        "file_path": file_path,
-                        "tool_name": response.get("toolName"),
-                        "content": args.get("content"),
-                    }
-                    return True, None
-
-            if rtype == "tool_result":
-                tool_call_id = str(response.get("toolCallId") or "")
-                pending = self._pending_artifact_ops.pop(tool_call_id, None)
-                if pending is not None:
-                    content = pending.get("content")
-                    if pending.get("tool_name") == "edit_file" and content is None:
-                        content = await self._read_file_content(pending.get("file_path", ""))
-
-                    artifact = self._extract_artifact_metadata(
-                        file_path=str(pending.get("file_path", "")),
-                        content_str=content,
-                    )
-                    if artifact is not None:
-                        evt_type = f"data-{artifact.get('artifact_type')}"
-                        return True, {"type": evt_type, "data": artifact}
-                    return True, None
-        except Exception as intercept_exc:
-            logger.debug(f"Artifact event interception failed: {intercept_exc}")
-        return False, None
-
     async def run(self, *, session: UserAgentSession, messages: list[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
         """Run the root cause analysis workflow."""
         try:
             logger.info("Starting Root Cause Analysis workflow")
 
-            # Call prepare
-            async for event in self.prepare(session=session, messages=messages):
-                yield event
+            # Continuing sessions already have a prepared workspace; skip prepare() without creating it
+            if not session.llm_session_id:
+                async for event in self.prepare(session=session, messages=messages):
+                    yield event
 
             system_prompt = await self._prepare_system_prompt(session=session)
 
@@ -180,7 +113,8 @@ class RootCauseAnalysisWorkflow(AgentWorkflow):
                     if event is not None:
                         yield event
                         logger.info(
-                            f"Artifact event emitted after tool_result: {event.get('type')}",
+                            "Artifact event emitted after tool_result: {}",
+                            event.get("type"),
                             extra={"artifact": (event.get("data") or {}).get("artifact_id")},
                         )
                     continue
@@ -219,14 +153,9 @@ class RootCauseAnalysisWorkflow(AgentWorkflow):
         if not normalized_path.startswith("artifacts/"):
             return None
 
-        path_obj = Path(normalized_path)
-        filename = path_obj.name
-        parent_dir = path_obj.parent.name
-        content_type = "json" if filename.endswith(".json") else "md"
-
-        # Only process JSON files for RCA artifacts
-        if not filename.endswith(".json"):
-            return None
+        # Split off filename and parent directory name with plain string ops (no Path objects)
+        parent_path, _, filename = normalized_path.rpartition("/")
+        parent_dir = parent_path.rpartition("/")[2]
 
         parsed_content = try_parse_json_content(content_str)
         if not parsed_content:
@@ -253,7 +182,7 @@ class RootCauseAnalysisWorkflow(AgentWorkflow):
             "actual_file_path": file_path,
             "file_path": normalized_path,
             "filename": filename,
-            "content_type": content_type,
+            "content_type": "json",
             "artifact_id": artifact_id,
             "content": parsed_content,
         }
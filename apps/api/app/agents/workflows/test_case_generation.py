@@ -11,9 +11,11 @@ from app.agents.enums import AgentIdentifier
 from app.agents.workflows.base import AgentWorkflow
 from app.agents.workflows.factory import register
 from app.models.user_agent_session import UserAgentSession
-from app.services.integration_service import IntegrationService
 from app.utils.helpers import try_parse_json_content
 
+# Runs of characters that are not allowed in a slug; a run already includes any hyphens, so it collapses them too
+_SLUG_DISALLOWED_RUN = re.compile(r"[^a-z0-9]+")
+
 
 @register(AgentIdentifier.TEST_CASE_GENERATION)
 class TestCaseGenerationWorkflow(AgentWorkflow):
@@ -21,25 +23,8 @@ class TestCaseGenerationWorkflow(AgentWorkflow):
 
     identifier = AgentIdentifier.TEST_CASE_GENERATION
 
-    def __init__(
-        self,
-        *,
-        workspace_dir: Path,
-        mcp_configs: dict[str, Any],
-        integration_service: IntegrationService,
-        system_prompt: str | None = None,
-        llm_session_id: str | None = None,
-    ) -> None:
-        """Initialize workflow with required parameters and renderer."""
-        super().__init__(
-            workspace_dir=workspace_dir,
-            mcp_configs=mcp_configs,
-            integration_service=integration_service,
-            system_prompt=system_prompt,
-            llm_session_id=llm_session_id,
-        )
-        # Track file-op tool calls until their corresponding tool_result arrives
-        self._pending_artifact_ops: dict[str, dict[str, Any]] = {}
+    # Sources and test cases are written under tests/ rather than artifacts/
+    _ARTIFACT_DIR = "tests"
 
     async def prepare(
         self, *, session: UserAgentSession, messages: list[dict[str, Any]]
@@ -54,23 +39,17 @@ class TestCaseGenerationWorkflow(AgentWorkflow):
 
         try:
             tests_dir = self.workspace_dir / "tests"
-            tests_dir.mkdir(parents=True, exist_ok=True)
 
-            # Attempt to pre-create per-source folders for faster LLM writes
             custom_properties: dict[str, Any] = session.custom_properties or {}
             inputs: list[dict[str, Any]] = custom_properties.get("inputs", []) or []
             docs: list[dict[str, Any]] = custom_properties.get("docs", []) or []
 
-            # Process inputs
-            for source in inputs:
-                source_key = self._compute_source_key(source)
-                if not source_key:
-                    continue
-                (tests_dir / source_key).mkdir(parents=True, exist_ok=True)
+            # Create tests/ and pre-create per-source folders for faster LLM writes in one worker-thread hop
+            source_keys = (self._compute_source_key(source) for source in inputs)
+            await self._make_dirs(tests_dir, *(tests_dir / source_key for source_key in source_keys if source_key))
 
-            # Process file-based inputs and documents
-            await self._process_file_documents(inputs)
-            await self._process_file_documents(docs)
+            # Copy file-based inputs and documents in a single batch
+            await self._copy_files_to_workspace(self._file_document_names(inputs) + self._file_document_names(docs))
 
             logger.info("Workspace prepared for filesystem outputs", extra={"tests_dir": str(tests_dir)})
         except Exception as exc:
@@ -80,18 +59,21 @@ class TestCaseGenerationWorkflow(AgentWorkflow):
         for _ in ():
             yield {}
 
-    async def _process_file_documents(self, docs: list[dict[str, Any]]) -> None:
-        """Process file-based documents by copying them to the workspace.
+    @staticmethod
+    def _file_document_names(docs: list[dict[str, Any]]) -> list[str]:
+        """Collect the names of file-based documents to copy into the workspace.
 
         Args:
             docs: List of document references from custom_properties
         """
+        file_names: list[str] = []
         for doc in docs:
             provider = doc.get("provider", "").lower()
             if provider == "file":
                 file_name = doc.get("file_name")
                 if isinstance(file_name, str) and file_name.strip():
-                    await self._copy_file_to_workspace(file_name)
+                    file_names.append(file_name)
+        return file_names
 
     def _compute_source_key(self, source: dict[str, Any]) -> str | None:
         """Compute deterministic identifier for a source.
@@ -134,54 +116,10 @@ class TestCaseGenerationWorkflow(AgentWorkflow):
     def _slugify(self, value: str) -> str:
         """Create a filesystem-friendly slug from the given string."""
         lowered = value.strip().lower()
-        # Replace non-alphanumeric with hyphens
-        replaced = re.sub(r"[^a-z0-9]+", "-", lowered)
-        # Collapse multiple hyphens and trim
-        collapsed = re.sub(r"-+", "-", replaced).strip("-")
+        # Replace each run of non-alphanumerics (hyphens included) with a single hyphen and trim
+        collapsed = _SLUG_DISALLOWED_RUN.sub("-", lowered).strip("-")
         return collapsed or "untitled"
 
-    async def _maybe_intercept_artifact_event(self, response: dict[str, Any]) -> tuple[bool, dict[str, Any] | None]:
-        """Intercept file operation tool events and emit normalized artifact events.
-
-        Returns:
-            handled: Whether the caller should suppress the original `response`.
-            event: The replacement event to emit (if any). When None and handled is True,
-                   the original response should be suppressed with no replacement.
-        """
-        try:
-            rtype = response.get("type")
-            if rtype == "tool_call" and response.get("toolName") in {"create_file", "edit_file"}:
-                tool_call_id = str(response.get("toolCallId") or "")
-                args = response.get("args") or {}
-                file_path = str(args.get("file_path") or args.get("path") or "")
-                if tool_call_id and file_path:
-                    self._pending_artifact_ops[tool_call_id] = {
-                        "file_path": file_path,
-                        "tool_name": response.get("toolName"),
-                        "content": args.get("content"),
-                    }
-                    return True, None
-
-            if rtype == "tool_result":
-                tool_call_id = str(response.get("toolCallId") or "")
-                pending = self._pending_artifact_ops.pop(tool_call_id, None)
-                if pending is not None:
-                    content = pending.get("content")
-                    if pending.get("tool_name") == "edit_file" and content is None:
-                        content = await self._read_file_content(pending.get("file_path", ""))
-
-                    artifact = self._extract_artifact_metadata(
-                        file_path=str(pending.get("file_path", "")),
-                        content_str=content,
-                    )
-                    if artifact is not None:
-                        evt_type = f"data-{artifact.get('artifact_type')}"
-                        return True, {"type": evt_type, "data": artifact}
-                    return True, None
-        except Exception as intercept_exc:
-            logger.debug(f"Artifact event interception failed: {intercept_exc}")
-        return False, None
-
     async def run(self, *, session: UserAgentSession, messages: list[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
         """Run the test case generation workflow."""
         try:
@@ -213,7 +151,8 @@ class TestCaseGenerationWorkflow(AgentWorkflow):
                     if event is not None:
                         yield event
                         logger.info(
-                            f"Artifact event emitted after tool_result: {event.get('type')}",
+                            "Artifact event emitted after tool_result: {}",
+                            event.get("type"),
                             extra={"artifact": (event.get("data") or {}).get("artifact_id")},
                         )
                     continue
@@ -4,6 +4,7 @@ import json
 from collections.abc import Mapping
 from datetime import datetime, timedelta
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
 from jinja2 import Environment, FileSystemLoader
@@ -40,6 +41,9 @@ class TemplateRenderer:
             trim_blocks=True,
             lstrip_blocks=True,
             enable_async=True,
+            # Templates ship with the app: compile each once and never stat for changes
+            auto_reload=False,
+            cache_size=-1,
         )
 
         # Add custom functions for MCP templates
@@ -61,6 +65,21 @@ class TemplateRenderer:
         template = self.env.get_template(template_name)
         return await template.render_async(**context)
 
+    def precompile(self, prefix: str) -> int:
+        """
+        Compile every template under a folder so the first render skips parsing.
+
+        Args:
+            prefix: Template folder prefix, e.g. "code_analysis/"
+
+        Returns:
+            Number of templates compiled
+        """
+        names = self.env.list_templates(filter_func=lambda name: name.startswith(prefix))
+        for name in names:
+            self.env.get_template(name)
+        return len(names)
+
     async def get_template_json(self, *, template_name: str) -> dict[str, Any]:
         """
         Get a template by name and return it as parsed JSON.
@@ -80,12 +99,14 @@ class TemplateRenderer:
         return json.loads(source)  # type: ignore
 
 
-# Convenience factory functions
+# Convenience factory functions; renderers are shared so compiled templates are reused across requests
+@lru_cache
 def create_agent_renderer() -> TemplateRenderer:
     """Create a template renderer for agent prompts."""
     return TemplateRenderer(TemplateType.AGENT)
 
 
+@lru_cache
 def create_mcp_renderer() -> TemplateRenderer:
     """Create a template renderer for MCP configurations."""
     return TemplateRenderer(TemplateType.MCP)
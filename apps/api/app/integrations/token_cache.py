@@ -0,0 +1,32 @@
+"""In-process cache of GitHub access tokens, keyed by user id."""
+
+import time
+
+# Tokens are reused for a short TTL so repeated agent runs skip the integration lookup and token generation
+GITHUB_TOKEN_TTL_SECONDS = 600.0
+
+# user id -> (token, monotonic expiry)
+_github_tokens: dict[int, tuple[str, float]] = {}
+
+
+def get_github_token(user_id: int) -> str | None:
+    """Return the cached GitHub token for a user, or None when missing or expired."""
+    cached = _github_tokens.get(user_id)
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+    return None
+
+
+def set_github_token(user_id: int, token: str) -> None:
+    """Cache a user's GitHub token for GITHUB_TOKEN_TTL_SECONDS."""
+    _github_tokens[user_id] = (token, time.monotonic() + GITHUB_TOKEN_TTL_SECONDS)
+
+
+def invalidate_github_token(user_id: int) -> None:
+    """Drop a user's cached GitHub token (e.g., after an auth failure or an integration change)."""
+    _github_tokens.pop(user_id, None)
+
+
+def clear() -> None:
+    """Drop every cached token."""
+    _github_tokens.clear()
@@ -2,7 +2,7 @@
 
 from typing import Any
 
-from sqlalchemy import JSON, Text
+from sqlalchemy import JSON, Enum, Text
 from sqlmodel import Field
 
 from app.agents.enums import AgentIdentifier, AgentModule
@@ -16,7 +16,7 @@ class AIAgent(BaseModel, table=True):
     - id: Primary key (bigint)
     - name: Agent name (text)
     - description: Agent description (text)
-    - identifier: Type of workflow to use (enum)
+    - identifier: Type of workflow to use (enum stored as varchar)
     - module: Category of the agent e.g. QA (enum)
     - tags: Tags to be used on agent definition (jsonb)
     - is_active: Agent status (boolean)
@@ -27,7 +27,11 @@ class AIAgent(BaseModel, table=True):
 
     name: str = Field(sa_type=Text, index=True, description="Agent name")
     description: str = Field(sa_type=Text, description="Agent description")
-    identifier: AgentIdentifier = Field(description="Type of workflow to use", unique=True)
+    identifier: AgentIdentifier = Field(
+        sa_type=Enum(AgentIdentifier, native_enum=False, length=64),
+        description="Type of workflow to use",
+        unique=True,
+    )
     module: AgentModule = Field(description="Category of the agent e.g. QA")
     tags: list[str] = Field(default_factory=list, sa_type=JSON, description="Tags to be used on agent definition")
     is_active: bool = Field(default=True, description="Agent status")
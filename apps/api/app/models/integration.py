@@ -2,7 +2,7 @@
 
 from typing import Any
 
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Enum
 from sqlalchemy.schema import UniqueConstraint
 from sqlmodel import Field
 
@@ -25,17 +25,18 @@ class Integration(AuditedModel, table=True):
     - auth_type: Authentication type (OAuth/API Key/PAT)
     - credentials: JSONB field for integration configuration
     - is_active: Integration status
-    - type: Integration type
+    - type: Integration type (enum stored as varchar)
 
     Business Rules:
     - Each user can only have ONE integration per type (Atlassian, Notion, GitHub)
-    - This is enforced by the unique constraint on (type, created_by)
+    - This is enforced by the unique constraint on (created_by, type)
     """
 
     __tablename__ = "integrations"
     __table_args__ = (
         # Business rule: Only one integration per type per user
-        UniqueConstraint("type", "created_by", name="uq_integration_type_user"),
+        # (created_by leads so the index also serves the per-user lookups every query applies)
+        UniqueConstraint("created_by", "type", name="uq_integration_type_user"),
         # Legacy constraint for backward compatibility (can be removed in future migration)
         UniqueConstraint("type", "is_active", "created_by", name="uq_integration_type_active_created"),
         {"schema": None},
@@ -47,4 +48,6 @@ class Integration(AuditedModel, table=True):
         default_factory=dict, sa_type=JSON, description="Integration configuration JSONB"
     )
     is_active: bool = Field(default=True, description="Integration status")
-    type: IntegrationProvider = Field(description="Integration type")
+    type: IntegrationProvider = Field(
+        sa_type=Enum(IntegrationProvider, native_enum=False, length=64), description="Integration type"
+    )
@@ -10,7 +10,7 @@ from fastapi import HTTPException, status
 from loguru import logger
 
 from app.agents.catalog import AgentCatalog
-from app.agents.enums import AgentIdentifier
+from app.agents.enums import AgentIdentifier, parse_agent_identifier
 from app.agents.workflows.factory import workflow_factory
 from app.crud.ai_agent import AIAgentCRUD
 from app.crud.project import ProjectCRUD
@@ -59,9 +59,8 @@ class AgentService:
             Dict containing session details including session_id, project_id, agent_id, and workspace_path
         """
         # Validate agent identifier
-        try:
-            agent_identifier_enum = AgentIdentifier(agent_identifier)
-        except ValueError:
+        agent_identifier_enum = parse_agent_identifier(agent_identifier)
+        if agent_identifier_enum is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid agent identifier: {agent_identifier}",
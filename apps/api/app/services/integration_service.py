@@ -5,6 +5,7 @@ from loguru import logger
 
 from app.core.template_renderer import create_mcp_renderer
 from app.crud.integration import IntegrationCRUD
+from app.integrations import token_cache
 from app.integrations.oauth.manager import OAuthProvidersManager
 from app.integrations.oauth.providers.base import TokenResult
 from app.models.integration import Integration
@@ -135,6 +136,8 @@ class IntegrationService:
             update_data.credentials.update(validated_creds)
 
         updated_integration = await self.crud.update_integration(db_obj=integration, obj_in=update_data)
+        # Rotated or deactivated credentials must not keep serving a cached token
+        token_cache.invalidate_github_token(self.crud.user_id)
 
         logger.info(f"Updated integration {integration_id}")
         return updated_integration
@@ -143,7 +146,10 @@ class IntegrationService:
         """
         Delete an integration.
         """
-        return await self.crud.delete_integration(integration_id=integration_id)
+        deleted = await self.crud.delete_integration(integration_id=integration_id)
+        if deleted:
+            token_cache.invalidate_github_token(self.crud.user_id)
+        return deleted
 
     async def get_access_token(self, *, integration_id: int) -> str | None:
         """
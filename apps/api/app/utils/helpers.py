@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import re
 import uuid
@@ -33,6 +34,33 @@ def generate_session_id() -> str:
     return f"claude-session-{uuid.uuid4().hex[:12]}"
 
 
+def stable_digest(value: str) -> str:
+    """
+    Return a deterministic 128-bit hex digest of a string.
+
+    Unlike the built-in hash(), the result is stable across processes, so it is safe
+    to use for identifiers that outlive a single worker (e.g. tool call IDs).
+    """
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def is_github_url(url: str) -> bool:
+    """
+    Return whether a repository URL points at github.com.
+
+    Uses plain string slicing rather than urlparse since it runs for every cloned repo.
+    Handles scheme URLs with optional userinfo/port and the scp-like SSH form.
+    """
+    lowered = url.lower()
+    if lowered.startswith("git@github.com:"):
+        return True
+    _, sep, rest = lowered.partition("://")
+    if not sep:
+        return False
+    host = rest.partition("/")[0].rpartition("@")[2].partition(":")[0]
+    return host == "github.com" or host.endswith(".github.com")
+
+
 def try_parse_json_content(content_str: str | bytes | dict) -> dict[str, Any] | None:
     """
     Parse JSON content from a string, bytes, or dict.
@@ -0,0 +1,741 @@
+"""Tests for agent workflow helpers."""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.agents.git.ops import GitOperationError
+from app.agents.workflows import base as workflow_base
+from app.agents.workflows.api_testing_suite import ApiTestingSuiteWorkflow
+from app.agents.workflows.code_analysis import CodeAnalysisWorkflow
+from app.agents.workflows.code_reviewer import CodeReviewerWorkflow
+from app.agents.workflows.requirements_to_tickets import RequirementsToTicketsWorkflow
+from app.agents.workflows.root_cause_analysis import RootCauseAnalysisWorkflow
+from app.agents.workflows.test_case_generation import TestCaseGenerationWorkflow
+from app.integrations import token_cache
+from app.services.integration_service import IntegrationService
+from app.utils.helpers import stable_digest
+
+
+def _integration_service(user_id: int = 1, token: str | None = "gh-token") -> MagicMock:
+    service = MagicMock()
+    service.crud.user_id = user_id
+    service.crud.get_by_provider = AsyncMock(return_value=MagicMock(id=7))
+    service.get_access_token = AsyncMock(return_value=token)
+    return service
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache() -> None:
+    """Isolate the in-process GitHub token cache between tests."""
+    token_cache.clear()
+
+
+def _workflow(tmp_path: Path, integration_service: MagicMock) -> ApiTestingSuiteWorkflow:
+    workspace_dir = tmp_path / "1" / "2" / "3"
+    workspace_dir.mkdir(parents=True)
+    return ApiTestingSuiteWorkflow(workspace_dir=workspace_dir, mcp_configs={}, integration_service=integration_service)
+
+
+class TestGithubTokenCache:
+    """Test GitHub token caching on AgentWorkflow."""
+
+    @pytest.mark.asyncio
+    async def test_token_is_cached_per_user(self, tmp_path: Path) -> None:
+        """Test repeated lookups reuse the cached token."""
+        service = _integration_service()
+        workflow = _workflow(tmp_path, service)
+
+        assert await workflow._get_github_token() == "gh-token"
+        assert await workflow._get_github_token() == "gh-token"
+        service.get_access_token.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_refetch(self, tmp_path: Path) -> None:
+        """Test invalidation drops the cached token."""
+        service = _integration_service()
+        workflow = _workflow(tmp_path, service)
+
+        await workflow._get_github_token()
+        workflow._invalidate_github_token()
+        await workflow._get_github_token()
+        assert service.get_access_token.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_missing_integration_is_not_cached(self, tmp_path: Path) -> None:
+        """Test users without a GitHub integration are looked up again next time."""
+        service = _integration_service()
+        service.crud.get_by_provider = AsyncMock(return_value=None)
+        workflow = _workflow(tmp_path, service)
+
+        assert await workflow._get_github_token() is None
+        assert await workflow._get_github_token() is None
+        assert service.crud.get_by_provider.await_count == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("change", ["update", "delete"])
+    async def test_integration_change_drops_cached_token(self, tmp_path: Path, change: str) -> None:
+        """Test updating or deleting an integration makes the next lookup fetch a fresh token."""
+        crud = MagicMock(user_id=1)
+        crud.get = AsyncMock(return_value=MagicMock(id=7))
+        crud.get_by_provider = AsyncMock(return_value=MagicMock(id=7))
+        crud.update_integration = AsyncMock()
+        crud.delete_integration = AsyncMock(return_value=True)
+        service = IntegrationService(crud=crud)
+        service.oauth_manager = MagicMock()
+        service.oauth_manager.validate_credentials = AsyncMock(return_value=None)
+        service.oauth_manager.get_access_token = AsyncMock(
+            return_value=MagicMock(access_token="old-token", credentials_updated=False)
+        )
+        workflow = _workflow(tmp_path, service)  # type: ignore[arg-type]
+        assert await workflow._get_github_token() == "old-token"
+
+        service.oauth_manager.get_access_token.return_value = MagicMock(
+            access_token="new-token", credentials_updated=False
+        )
+        if change == "update":
+            await service.update_integration(integration_id=7, update_data=MagicMock(credentials={}))
+        else:
+            await service.delete_integration(integration_id=7)
+
+        assert await workflow._get_github_token() == "new-token"
+
+
+class TestRelevantArtifactsIndex:
+    """Test index.json lookups in the API testing suite workflow."""
+
+    def _write_index(self, workflow: ApiTestingSuiteWorkflow, *filenames: str) -> Path:
+        index_path = workflow.workspace_dir / "artifacts" / "index.json"
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        index_path.write_text(json.dumps({"relevantArtifacts": [{"filename": name} for name in filenames]}))
+        return index_path
+
+    def test_missing_index(self, tmp_path: Path) -> None:
+        """Test lookups without an index.json return False."""
+        workflow = _workflow(tmp_path, _integration_service())
+        assert workflow._is_filename_in_relevant_artifacts("users.spec.ts") is False
+
+    def test_index_is_reparsed_only_when_changed(self, tmp_path: Path) -> None:
+        """Test the parsed index is reused until the file changes."""
+        workflow = _workflow(tmp_path, _integration_service())
+        index_path = self._write_index(workflow, "users.spec.ts")
+
+        assert workflow._is_filename_in_relevant_artifacts("users.spec.ts") is True
+        assert workflow._is_filename_in_relevant_artifacts("orders.spec.ts") is False
+        cached = workflow._relevant_artifacts_cache
+
+        assert workflow._is_filename_in_relevant_artifacts("users.spec.ts") is True
+        assert workflow._relevant_artifacts_cache is cached
+
+        self._write_index(workflow, "users.spec.ts", "orders.spec.ts")
+        stat = index_path.stat()
+        os.utime(index_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert workflow._is_filename_in_relevant_artifacts("orders.spec.ts") is True
+
+    def test_extract_artifact_metadata(self, tmp_path: Path) -> None:
+        """Test listed artifact files are extracted and paths outside artifacts/ are ignored."""
+        workflow = _workflow(tmp_path, _integration_service())
+        self._write_index(workflow, "users.spec.ts")
+        file_path = str(workflow.workspace_dir / "artifacts" / "automation" / "users.spec.ts")
+
+        artifact = workflow._extract_artifact_metadata(file_path=file_path, content_str="test()")
+
+        assert artifact is not None
+        assert artifact["file_path"] == "artifacts/automation/users.spec.ts"
+        assert artifact["artifact_id"] == "users.spec"
+        assert artifact["content_type"] == "typescript"
+        assert workflow._extract_artifact_metadata(file_path="/tmp/users.spec.ts", content_str="test()") is None
+
+
+class TestArtifactInterception:
+    """Test _maybe_intercept_artifact_event on the API testing suite workflow."""
+
+    @pytest.mark.asyncio
+    async def test_non_tool_events_pass_through(self, tmp_path: Path) -> None:
+        """Test text events and non file-op tool calls are not intercepted."""
+        workflow = _workflow(tmp_path, _integration_service())
+
+        assert await workflow._maybe_intercept_artifact_event({"type": "text", "data": {"text": "hi"}}) == (False, None)
+        tool_call = {"type": "tool_call", "toolCallId": "t1", "toolName": "read_file", "args": {"file_path": "a"}}
+        assert await workflow._maybe_intercept_artifact_event(tool_call) == (False, None)
+        assert workflow._pending_artifact_ops == {}
+
+    @pytest.mark.asyncio
+    async def test_file_op_becomes_artifact_event(self, tmp_path: Path) -> None:
+        """Test a create_file call is held back and its result is replaced by an artifact event."""
+        workflow = _workflow(tmp_path, _integration_service())
+        file_path = str(workflow.workspace_dir / "artifacts" / "index.json")
+        tool_call = {
+            "type": "tool_call",
+            "toolCallId": "t1",
+            "toolName": "create_file",
+            "args": {"file_path": file_path, "content": '{"relevantArtifacts": []}'},
+        }
+
+        assert await workflow._maybe_intercept_artifact_event(tool_call) == (True, None)
+        handled, event = await workflow._maybe_intercept_artifact_event(
+            {"type": "tool_result", "toolCallId": "t1", "result": "ok"}
+        )
+
+        assert handled is True
+        assert event is not None
+        assert event["type"] == "data-index"
+        assert event["data"]["content"] == {"relevantArtifacts": []}
+
+
+class TestCodeReviewerArtifacts:
+    """Test artifact extraction in the code reviewer workflow."""
+
+    def _workflow(self, tmp_path: Path) -> CodeReviewerWorkflow:
+        workspace_dir = tmp_path / "1" / "2" / "3"
+        workspace_dir.mkdir(parents=True)
+        return CodeReviewerWorkflow(
+            workspace_dir=workspace_dir, mcp_configs={}, integration_service=_integration_service()
+        )
+
+    def test_known_review_files(self, tmp_path: Path) -> None:
+        """Test index.json and comments.json become artifacts named after the file."""
+        workflow = self._workflow(tmp_path)
+        artifact = workflow._extract_artifact_metadata(
+            file_path=str(workflow.workspace_dir / "artifacts" / "comments.json"), content_str='{"comments": []}'
+        )
+
+        assert artifact is not None
+        assert artifact["artifact_type"] == artifact["artifact_id"] == "comments"
+        assert artifact["file_path"] == "artifacts/comments.json"
+        assert artifact["content"] == {"comments": []}
+
+    def test_other_files_are_ignored(self, tmp_path: Path) -> None:
+        """Test unknown artifact files and files outside artifacts/ are not intercepted."""
+        workflow = self._workflow(tmp_path)
+
+        for path in ("artifacts/notes.json", "artifacts/report.md", "src/index.json"):
+            file_path = str(workflow.workspace_dir / path)
+            assert workflow._extract_artifact_metadata(file_path=file_path, content_str="{}") is None
+
+
+class TestTicketArtifacts:
+    """Test artifact extraction in the requirements to tickets workflow."""
+
+    def _workflow(self, tmp_path: Path) -> RequirementsToTicketsWorkflow:
+        workspace_dir = tmp_path / "1" / "2" / "3"
+        workspace_dir.mkdir(parents=True)
+        return RequirementsToTicketsWorkflow(
+            workspace_dir=workspace_dir, mcp_configs={}, integration_service=_integration_service()
+        )
+
+    @pytest.mark.parametrize(("folder", "artifact_type"), [("epics", "epic"), ("stories", "story"), ("tasks", "task")])
+    def test_ticket_type_from_folder(self, tmp_path: Path, folder: str, artifact_type: str) -> None:
+        """Test the ticket folder selects the artifact type and the filename stem is the default id."""
+        workflow = self._workflow(tmp_path)
+        artifact = workflow._extract_artifact_metadata(
+            file_path=str(workflow.workspace_dir / "artifacts" / folder / "T-1.json"), content_str='{"title": "x"}'
+        )
+
+        assert artifact is not None
+        assert artifact["artifact_type"] == artifact_type
+        assert artifact["artifact_id"] == "T-1"
+        assert artifact["file_path"] == f"artifacts/{folder}/T-1.json"
+
+    def test_unknown_folder_is_ignored(self, tmp_path: Path) -> None:
+        """Test files outside the ticket folders are not intercepted."""
+        workflow = self._workflow(tmp_path)
+        file_path = str(workflow.workspace_dir / "artifacts" / "notes" / "T-1.json")
+
+        assert workflow._extract_artifact_metadata(file_path=file_path, content_str="{}") is None
+
+    @pytest.mark.asyncio
+    async def test_edit_of_non_json_file_skips_read(self, tmp_path: Path) -> None:
+        """Test edits to files that cannot be artifacts are suppressed without reading them back."""
+        workflow = self._workflow(tmp_path)
+        workflow._read_file_content = AsyncMock(return_value="# notes")  # type: ignore[method-assign]
+        file_path = str(workflow.workspace_dir / "artifacts" / "epics" / "notes.md")
+
+        await workflow._maybe_intercept_artifact_event(
+            {"type": "tool_call", "toolName": "edit_file", "toolCallId": "t1", "args": {"file_path": file_path}}
+        )
+        handled, event = await workflow._maybe_intercept_artifact_event({"type": "tool_result", "toolCallId": "t1"})
+
+        assert (handled, event) == (True, None)
+        workflow._read_file_content.assert_not_awaited()
+
+
+class TestRootCauseAnalysisArtifacts:
+    """Test artifact extraction in the root cause analysis workflow."""
+
+    def _workflow(self, tmp_path: Path) -> RootCauseAnalysisWorkflow:
+        workspace_dir = tmp_path / "1" / "2" / "3"
+        workspace_dir.mkdir(parents=True)
+        return RootCauseAnalysisWorkflow(
+            workspace_dir=workspace_dir, mcp_configs={}, integration_service=_integration_service()
+        )
+
+    def test_solution_file(self, tmp_path: Path) -> None:
+        """Test sol-* files under artifacts/solutions/ become solution artifacts."""
+        workflow = self._workflow(tmp_path)
+        artifact = workflow._extract_artifact_metadata(
+            file_path=str(workflow.workspace_dir / "artifacts" / "solutions" / "sol-1.json"),
+            content_str='{"solution_id": "SOL-1"}',
+        )
+
+        assert artifact is not None
+        assert artifact["artifact_type"] == "solution"
+        assert artifact["artifact_id"] == "SOL-1"
+        assert artifact["filename"] == "sol-1.json"
+
+    def test_non_json_and_misplaced_files_are_ignored(self, tmp_path: Path) -> None:
+        """Test markdown files and sol-* files outside solutions/ are not intercepted."""
+        workflow = self._workflow(tmp_path)
+
+        for path in ("artifacts/rca.md", "artifacts/sol-1.json"):
+            file_path = str(workflow.workspace_dir / path)
+            assert workflow._extract_artifact_metadata(file_path=file_path, content_str='{"solution_id": "x"}') is None
+
+
+@pytest.mark.parametrize(
+    ("workflow_cls", "file_path", "expected"),
+    [
+        (ApiTestingSuiteWorkflow, "/ws/artifacts/automation/users.spec.ts", True),
+        (ApiTestingSuiteWorkflow, "/ws/src/users.spec.ts", False),
+        (CodeReviewerWorkflow, "/ws/artifacts/comments.json", True),
+        (CodeReviewerWorkflow, "/ws/artifacts/notes.md", False),
+        (RequirementsToTicketsWorkflow, "/ws/artifacts/epics/E-1.json", True),
+        (RootCauseAnalysisWorkflow, "/ws/rca.json", False),
+        (TestCaseGenerationWorkflow, "/ws/tests/jira/TC-1.json", True),
+        (TestCaseGenerationWorkflow, "/ws/artifacts/TC-1.json", False),
+    ],
+)
+def test_is_artifact_candidate(workflow_cls: type, file_path: str, expected: bool) -> None:
+    """Test each workflow's artifact folder and suffix drive the shared candidate check."""
+    assert workflow_cls._is_artifact_candidate(file_path) is expected
+
+
+class TestCodeAnalysisPrepare:
+    """Test repository cloning in the code analysis prepare step."""
+
+    def _workflow(self, tmp_path: Path) -> CodeAnalysisWorkflow:
+        workspace_dir = tmp_path / "1" / "2" / "3"
+        return CodeAnalysisWorkflow(
+            workspace_dir=workspace_dir, mcp_configs={}, integration_service=_integration_service()
+        )
+
+    async def _prepare(self, workflow: CodeAnalysisWorkflow, repos: list[dict]) -> list[dict]:
+        session = MagicMock(llm_session_id=None, custom_properties={"github_repos": repos})
+        return [event async for event in workflow.prepare(session=session, messages=[])]
+
+    @pytest.mark.asyncio
+    async def test_clones_concurrently(self, tmp_path: Path) -> None:
+        """Test all clones are started before any finishes and every repo reports a result."""
+        workflow = self._workflow(tmp_path)
+        started: list[str] = []
+        release = asyncio.Event()
+
+        async def _clone(*, url: str, destination_dir: Path, **kwargs: object) -> Path:
+            started.append(url)
+            if len(started) == 2:
+                release.set()
+            await release.wait()
+            return destination_dir / url.rsplit("/", 1)[-1]
+
+        workflow.git_ops.clone_repository = AsyncMock(side_effect=_clone)
+
+        events = await self._prepare(
+            workflow, [{"url": "https://github.com/acme/one"}, {"url": "https://github.com/acme/two"}]
+        )
+
+        assert [event["type"] for event in events] == ["tool_call", "tool_call", "tool_result", "tool_result"]
+        assert events[0]["toolCallId"] == f"git_clone_{stable_digest('https://github.com/acme/one')}"
+        assert sorted(started) == ["https://github.com/acme/one", "https://github.com/acme/two"]
+
+    @pytest.mark.asyncio
+    async def test_clone_failure_cancels_remaining(self, tmp_path: Path) -> None:
+        """Test a failed clone raises and cancels clones still in flight."""
+        workflow = self._workflow(tmp_path)
+        cancelled = asyncio.Event()
+
+        async def _clone(*, url: str, destination_dir: Path, **kwargs: object) -> Path:
+            if "broken" in url:
+                raise GitOperationError("boom")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return destination_dir
+
+        workflow.git_ops.clone_repository = AsyncMock(side_effect=_clone)
+
+        with pytest.raises(GitOperationError):
+            await self._prepare(
+                workflow, [{"url": "https://github.com/acme/slow"}, {"url": "https://github.com/acme/broken"}]
+            )
+        await asyncio.sleep(0)
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_shared_checkout_dir_clones_serially(self, tmp_path: Path) -> None:
+        """Test URLs that map to the same checkout dir are never cloned at the same time."""
+        workflow = self._workflow(tmp_path)
+        active: set[Path] = set()
+        overlapped = False
+
+        async def _clone(*, url: str, destination_dir: Path, **kwargs: object) -> Path:
+            nonlocal overlapped
+            repo_path = workflow.git_ops.checkout_path(url=url, destination_dir=destination_dir)
+            overlapped = overlapped or repo_path in active
+            active.add(repo_path)
+            await asyncio.sleep(0.01)
+            active.discard(repo_path)
+            return repo_path
+
+        workflow.git_ops.clone_repository = AsyncMock(side_effect=_clone)
+
+        events = await self._prepare(
+            workflow, [{"url": "https://github.com/acme/one"}, {"url": "https://github.com/acme/one.git"}]
+        )
+
+        assert [event["type"] for event in events] == ["tool_call", "tool_call", "tool_result", "tool_result"]
+        assert not overlapped
+
+    @pytest.mark.asyncio
+    async def test_entries_without_url_are_skipped(self, tmp_path: Path) -> None:
+        """Test repo entries missing a url are skipped instead of failing the clone step."""
+        workflow = self._workflow(tmp_path)
+        workflow.git_ops.clone_repository = AsyncMock(return_value=tmp_path / "acme-one")
+
+        events = await self._prepare(workflow, [{"branch": "dev"}, {"url": "https://github.com/acme/one"}])
+
+        assert [event["type"] for event in events] == ["tool_call", "tool_result"]
+        assert events[1]["toolCallId"] == f"git_clone_{stable_digest('https://github.com/acme/one')}"
+        workflow.git_ops.clone_repository.assert_awaited_once()
+
+
+class TestCodeAnalysisFollowupPrompt:
+    """Test the cached followup system prompt in the code analysis workflow."""
+
+    @pytest.mark.asyncio
+    async def test_followup_prompt_is_rendered_once(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test continuing sessions reuse the followup prompt rendered by an earlier workflow."""
+        monkeypatch.setattr(CodeAnalysisWorkflow, "_followup_system_prompt", None)
+        workflows = [
+            CodeAnalysisWorkflow(
+                workspace_dir=tmp_path, mcp_configs={}, integration_service=_integration_service(), llm_session_id="s"
+            )
+            for _ in range(2)
+        ]
+        render = AsyncMock(return_value="followup")
+        for workflow in workflows:
+            workflow.prompt_renderer = MagicMock(render=render)
+
+        prompts = [await workflow._prepare_system_prompt(session=MagicMock()) for workflow in workflows]
+
+        assert prompts == ["followup", "followup"]
+        render.assert_awaited_once()
+
+
+class TestPrefetch:
+    """Test AgentWorkflow._prefetch."""
+
+    @pytest.mark.asyncio
+    async def test_relays_items_in_order(self) -> None:
+        """Test every item is relayed in order through a small buffer."""
+
+        async def _source():
+            for i in range(20):
+                yield i
+
+        assert [item async for item in workflow_base.AgentWorkflow._prefetch(_source(), size=2)] == list(range(20))
+
+    @pytest.mark.asyncio
+    async def test_reraises_producer_error(self) -> None:
+        """Test a failure in the source surfaces in the consumer."""
+
+        async def _source():
+            yield 1
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            [item async for item in workflow_base.AgentWorkflow._prefetch(_source())]
+
+    @pytest.mark.asyncio
+    async def test_early_close_closes_source(self) -> None:
+        """Test closing the relay early stops and closes the source."""
+        closed = asyncio.Event()
+
+        async def _source():
+            try:
+                for i in range(100):
+                    yield i
+            finally:
+                closed.set()
+
+        relay = workflow_base.AgentWorkflow._prefetch(_source(), size=2)
+        assert await relay.__anext__() == 0
+        await relay.aclose()
+        assert closed.is_set()
+
+
+class TestRelativizeToWorkspace:
+    """Test AgentWorkflow._relativize_to_workspace."""
+
+    def test_paths_under_workspace(self, tmp_path: Path) -> None:
+        """Test absolute workspace paths are relativized and normalized."""
+        workflow = _workflow(tmp_path, _integration_service())
+        workspace = workflow.workspace_dir
+
+        assert (
+            workflow._relativize_to_workspace(str(workspace / "artifacts" / "a.ts"), "artifacts/") == "artifacts/a.ts"
+        )
+        assert (
+            workflow._relativize_to_workspace(workspace / "tests" / "x" / ".." / "b.json", "tests/") == "tests/b.json"
+        )
+        escaped = workflow._relativize_to_workspace(f"{workspace}/artifacts/../../outside.txt", "artifacts/")
+        assert not escaped.startswith("artifacts/")
+
+    def test_symlinked_workspace(self, tmp_path: Path) -> None:
+        """Test paths reported through the resolved workspace location are relativized."""
+        real = tmp_path / "real"
+        real.mkdir()
+        (tmp_path / "1" / "2").mkdir(parents=True)
+        link = tmp_path / "1" / "2" / "3"
+        link.symlink_to(real)
+        workflow = ApiTestingSuiteWorkflow(
+            workspace_dir=link, mcp_configs={}, integration_service=_integration_service()
+        )
+
+        assert workflow._relativize_to_workspace(str(real / "artifacts" / "a.ts"), "artifacts/") == "artifacts/a.ts"
+        assert workflow._relativize_to_workspace(str(link / "artifacts" / "a.ts"), "artifacts/") == "artifacts/a.ts"
+
+
+class TestWorkspaceFileIO:
+    """Test workspace file helpers on AgentWorkflow."""
+
+    @pytest.mark.asyncio
+    async def test_copy_file_to_workspace(self, tmp_path: Path) -> None:
+        """Test user files are copied into the workspace and missing files are skipped."""
+        workflow = _workflow(tmp_path, _integration_service())
+        workflow.files_dir.mkdir(parents=True, exist_ok=True)
+        (workflow.files_dir / "spec.md").write_text("# Spec")
+
+        await workflow._copy_file_to_workspace("spec.md")
+        await workflow._copy_file_to_workspace("missing.md")
+
+        assert (workflow.workspace_dir / "spec.md").read_text() == "# Spec"
+        assert not (workflow.workspace_dir / "missing.md").exists()
+
+    @pytest.mark.asyncio
+    async def test_copy_files_to_workspace_reports_each_file(self, tmp_path: Path) -> None:
+        """Test a batch copy copies what exists and keeps going past missing or failing files."""
+        workflow = _workflow(tmp_path, _integration_service())
+        workflow.files_dir.mkdir(parents=True, exist_ok=True)
+        (workflow.files_dir / "nested").mkdir()
+        (workflow.files_dir / "nested" / "b.md").write_text("b")
+        (workflow.files_dir / "c.md").write_text("c")
+
+        # nested/b.md fails to copy because the workspace has no nested/ directory
+        await workflow._copy_files_to_workspace(["nested/b.md", "missing.md", "c.md"])
+
+        assert not (workflow.workspace_dir / "nested").exists()
+        assert not (workflow.workspace_dir / "missing.md").exists()
+        assert (workflow.workspace_dir / "c.md").read_text() == "c"
+
+    @pytest.mark.asyncio
+    async def test_read_file_content(self, tmp_path: Path) -> None:
+        """Test relative paths resolve against the workspace and missing files return None."""
+        workflow = _workflow(tmp_path, _integration_service())
+        (workflow.workspace_dir / "notes.txt").write_text("hello")
+
+        assert await workflow._read_file_content("notes.txt") == "hello"
+        assert await workflow._read_file_content("absent.txt") is None
+
+
+class TestRepositoryClone:
+    """Test repository cloning in the API testing suite prepare step."""
+
+    async def _prepare(self, workflow: ApiTestingSuiteWorkflow, repo: object) -> list[dict]:
+        session = MagicMock(custom_properties={"repo": repo})
+        return [event async for event in workflow.prepare(session=session, messages=[])]
+
+    @pytest.mark.asyncio
+    async def test_clones_list_of_repos(self, tmp_path: Path) -> None:
+        """Test every repo gets a tool call and a tool result, with failures reported per repo."""
+        workflow = _workflow(tmp_path, _integration_service())
+
+        async def _clone(*, url: str, destination_dir: Path, **kwargs: object) -> Path:
+            if "broken" in url:
+                raise GitOperationError("boom")
+            return destination_dir / url.rsplit("/", 1)[-1]
+
+        workflow.git_ops.clone_repository = AsyncMock(side_effect=_clone)
+        workflow.git_ops.create_branch = AsyncMock()
+
+        events = await self._prepare(
+            workflow,
+            [
+                {"url": "https://github.com/acme/one"},
+                {"url": "https://github.com/acme/broken"},
+                {"url": "https://github.com/acme/one"},
+                {"url": "https://github.com/acme/two"},
+            ],
+        )
+
+        calls = [event for event in events if event["type"] == "tool_call"]
+        results = {event["toolCallId"]: event["result"] for event in events if event["type"] == "tool_result"}
+        assert [call["args"]["url"] for call in calls] == [
+            "https://github.com/acme/one",
+            "https://github.com/acme/broken",
+            "https://github.com/acme/two",
+        ]
+        assert set(results) == {call["toolCallId"] for call in calls}
+        assert results[calls[0]["toolCallId"]].startswith("Repository https://github.com/acme/one successfully")
+        assert results[calls[1]["toolCallId"]].startswith("Error cloning repository")
+        assert workflow.git_ops.clone_repository.await_count == 3
+        branch_names = {call.kwargs["branch_name"] for call in workflow.git_ops.create_branch.await_args_list}
+        assert workflow.git_ops.create_branch.await_count == 2
+        assert len(branch_names) == 1
+
+    @pytest.mark.asyncio
+    async def test_early_close_cancels_clones(self, tmp_path: Path) -> None:
+        """Test clones still in flight are cancelled when the consumer stops early."""
+        workflow = _workflow(tmp_path, _integration_service())
+        cancelled = asyncio.Event()
+
+        async def _clone(*, url: str, destination_dir: Path, **kwargs: object) -> Path:
+            if "slow" in url:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            return destination_dir / url.rsplit("/", 1)[-1]
+
+        workflow.git_ops.clone_repository = AsyncMock(side_effect=_clone)
+        workflow.git_ops.create_branch = AsyncMock()
+        repos = [{"url": "https://github.com/acme/slow"}, {"url": "https://github.com/acme/fast"}]
+        session = MagicMock(custom_properties={"repo": repos})
+
+        events = workflow.prepare(session=session, messages=[])
+        async for event in events:
+            if event["type"] == "tool_result":
+                break
+        await events.aclose()
+        await asyncio.sleep(0)
+
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_shared_checkout_dir_clones_serially(self, tmp_path: Path) -> None:
+        """Test URLs that map to the same checkout dir never clone or branch at the same time."""
+        workflow = _workflow(tmp_path, _integration_service())
+        active: set[Path] = set()
+        overlapped = False
+
+        async def _clone(*, url: str, destination_dir: Path, **kwargs: object) -> Path:
+            nonlocal overlapped
+            repo_path = workflow.git_ops.checkout_path(url=url, destination_dir=destination_dir)
+            overlapped = overlapped or repo_path in active
+            active.add(repo_path)
+            await asyncio.sleep(0.01)
+            return repo_path
+
+        async def _create_branch(*, repo_path: Path, **kwargs: object) -> None:
+            await asyncio.sleep(0.01)
+            active.discard(repo_path)
+
+        workflow.git_ops.clone_repository = AsyncMock(side_effect=_clone)
+        workflow.git_ops.create_branch = AsyncMock(side_effect=_create_branch)
+
+        events = await self._prepare(
+            workflow, [{"url": "https://github.com/acme/one"}, {"url": "https://github.com/acme/one.git"}]
+        )
+
+        assert [event["type"] for event in events] == ["tool_call", "tool_call", "tool_result", "tool_result"]
+        assert not overlapped
+
+    @pytest.mark.asyncio
+    async def test_single_repo_dict(self, tmp_path: Path) -> None:
+        """Test the single-repo form emits a tool call followed by its result."""
+        workflow = _workflow(tmp_path, _integration_service())
+        workflow.git_ops.clone_repository = AsyncMock(return_value=tmp_path / "widgets")
+        workflow.git_ops.create_branch = AsyncMock()
+
+        events = await self._prepare(workflow, {"url": "https://github.com/acme/widgets", "branch": "dev"})
+
+        assert [event["type"] for event in events] == ["tool_call", "tool_result"]
+        assert workflow.git_ops.clone_repository.await_args.kwargs["branch"] == "dev"
+        assert workflow.git_ops.clone_repository.await_args.kwargs["access_token"] == "gh-token"
+
+    @pytest.mark.asyncio
+    async def test_no_repo(self, tmp_path: Path) -> None:
+        """Test sessions without a repo emit no events."""
+        workflow = _workflow(tmp_path, _integration_service())
+        assert await self._prepare(workflow, {}) == []
+
+
+@pytest.mark.parametrize(
+    ("filename", "expected"),
+    [
+        ("index.json", "json"),
+        ("users.spec.ts", "typescript"),
+        ("Users.SPEC.JS", "javascript"),
+        ("UsersTest.java", "java"),
+        ("test_users.py", "python"),
+        ("README.md", "text"),
+        ("json", "text"),
+    ],
+)
+def test_determine_content_type(tmp_path: Path, filename: str, expected: str) -> None:
+    """Test content types are derived from the final file extension."""
+    workflow = _workflow(tmp_path, _integration_service())
+    assert workflow._determine_content_type(filename) == expected
+
+
+class TestTestCaseGenerationPrepare:
+    """Test workspace preparation in the test case generation workflow."""
+
+    @pytest.mark.asyncio
+    async def test_creates_source_dirs_and_copies_files(self, tmp_path: Path) -> None:
+        """Test per-source folders are created and file inputs and docs are copied in one batch."""
+        workspace_dir = tmp_path / "1" / "2" / "3"
+        workspace_dir.mkdir(parents=True)
+        workflow = TestCaseGenerationWorkflow(
+            workspace_dir=workspace_dir, mcp_configs={}, integration_service=_integration_service()
+        )
+        workflow._copy_files_to_workspace = AsyncMock()  # type: ignore[method-assign]
+        session = MagicMock(
+            custom_properties={
+                "inputs": [
+                    {"type": "issue", "provider": "jira", "key": "ENG-1"},
+                    {"type": "document", "provider": "file", "file_name": "spec.pdf"},
+                ],
+                "docs": [{"type": "document", "provider": "file", "file_name": "guide.md"}],
+            }
+        )
+
+        assert [event async for event in workflow.prepare(session=session, messages=[])] == []
+
+        assert (workspace_dir / "tests" / "issue-jira-eng-1").is_dir()
+        assert (workspace_dir / "tests" / "document-file-spec_pdf").is_dir()
+        workflow._copy_files_to_workspace.assert_awaited_once_with(["spec.pdf", "guide.md"])
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("https://acme.atlassian.net/wiki/Spaces/ENG", "https-acme-atlassian-net-wiki-spaces-eng"),
+        ("  --Hello,   World!--  ", "hello-world"),
+        ("a--b__c", "a-b-c"),
+        ("!!!", "untitled"),
+        ("", "untitled"),
+    ],
+)
+def test_slugify(tmp_path: Path, value: str, expected: str) -> None:
+    """Test slugs keep only lowercase alphanumerics joined by single hyphens."""
+    workflow = TestCaseGenerationWorkflow(
+        workspace_dir=tmp_path, mcp_configs={}, integration_service=_integration_service()
+    )
+    assert workflow._slugify(value) == expected
@@ -1,7 +1,7 @@
 """Tests for agent enums."""
 
 
-from app.agents.enums import AgentIdentifier, AgentModule
+from app.agents.enums import AgentIdentifier, AgentModule, parse_agent_identifier
 
 
 class TestAgentIdentifier:
@@ -34,6 +34,22 @@ class TestAgentIdentifier:
         assert AgentIdentifier.TEST_CASE_GENERATION in identifiers
 
 
+class TestParseAgentIdentifier:
+    """Test parse_agent_identifier lookup."""
+
+    def test_parse_known_value(self):
+        """Test raw values resolve to their enum member."""
+        assert parse_agent_identifier("code_analysis") is AgentIdentifier.CODE_ANALYSIS
+
+    def test_parse_enum_member(self):
+        """Test enum members resolve to themselves."""
+        assert parse_agent_identifier(AgentIdentifier.CODE_REVIEWER) is AgentIdentifier.CODE_REVIEWER
+
+    def test_parse_unknown_value(self):
+        """Test unknown values return None instead of raising."""
+        assert parse_agent_identifier("invalid_type") is None
+
+
 class TestAgentModule:
     """Test AgentModule enum."""
 
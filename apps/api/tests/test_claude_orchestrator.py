@@ -0,0 +1,216 @@
+"""Tests for the Claude orchestrator."""
+
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from claude_code_sdk import (
+    AssistantMessage,
+    ResultMessage,
+    SystemMessage,
+    TextBlock,
+    ThinkingBlock,
+    ToolResultBlock,
+    ToolUseBlock,
+    UserMessage,
+)
+
+from app.agents.claude.orchestrator import ClaudeOrchestrator
+
+
+def _fake_query(*responses: Any, captured: list[Any] | None = None) -> Any:
+    """Build a stand-in for `claude_code_sdk.query` that replays the given responses."""
+
+    async def _query(*, prompt: str, options: Any) -> AsyncIterator[Any]:
+        if captured is not None:
+            captured.append(options)
+        for response in responses:
+            yield response
+
+    return _query
+
+
+async def _collect(orchestrator: ClaudeOrchestrator, **options: Any) -> list[dict[str, Any]]:
+    messages = [{"role": "user", "content": "hi"}]
+    return [event async for event in orchestrator.run(messages, **options)]
+
+
+@pytest.fixture
+def orchestrator(tmp_path: Path) -> ClaudeOrchestrator:
+    """Orchestrator rooted in a temporary workspace."""
+    return ClaudeOrchestrator(base_dir=tmp_path, mcp_configs={})
+
+
+class TestPermissionMode:
+    """Test permission mode resolution from settings."""
+
+    @pytest.mark.parametrize(
+        ("configured", "expected"),
+        [("acceptEdits", "acceptEdits"), ("default", "default"), ("yolo", "bypassPermissions")],
+    )
+    def test_permission_mode(self, tmp_path: Path, configured: str, expected: str) -> None:
+        """Test valid modes are kept and unknown ones fall back to bypassPermissions."""
+        with patch("app.agents.claude.orchestrator.get_settings") as mock_settings:
+            mock_settings.return_value.CLAUDE_PERMISSION_MODE = configured
+            orchestrator = ClaudeOrchestrator(base_dir=tmp_path, mcp_configs={})
+        assert orchestrator.claude_options["permission_mode"] == expected
+
+
+class TestPromptPreparation:
+    """Test conversion of chat messages into the SDK prompt."""
+
+    def test_prefixes_known_roles_and_skips_others(self, orchestrator: ClaudeOrchestrator) -> None:
+        """Test known roles are prefixed and unknown roles are dropped."""
+        messages = [
+            {"role": "system", "content": "Be brief"},
+            {"role": "user", "content": "Hi"},
+            {"role": "tool", "content": "ignored"},
+            {"role": "assistant", "content": "Hello"},
+        ]
+        assert orchestrator._prepare_llm_prompt(messages) == "System: Be brief\n\nUser: Hi\n\nAssistant: Hello"
+
+    def test_empty_messages(self, orchestrator: ClaudeOrchestrator) -> None:
+        """Test an empty conversation produces an empty prompt."""
+        assert orchestrator._prepare_llm_prompt([]) == ""
+
+
+class TestThinkingExtraction:
+    """Test thinking block extraction from assistant text."""
+
+    def test_extracts_thinking_and_remaining_text(self, orchestrator: ClaudeOrchestrator) -> None:
+        """Test thinking payload is captured and stripped from the text."""
+        remaining, thinking = orchestrator._extract_and_yield_thinking_block(
+            "Before <thinking> plan it </thinking> after"
+        )
+        assert remaining == "Before  after"
+        assert thinking is not None
+        assert thinking["type"] == "thinking"
+        assert thinking["data"]["text"] == "plan it"
+        assert thinking["data"]["signature"].startswith("reasoning_")
+
+    def test_strips_all_thinking_blocks(self, orchestrator: ClaudeOrchestrator) -> None:
+        """Test every thinking block is removed while the first one is emitted."""
+        remaining, thinking = orchestrator._extract_and_yield_thinking_block(
+            "<thinking>one</thinking>text<thinking>\ntwo\n</thinking>"
+        )
+        assert remaining == "text"
+        assert thinking is not None
+        assert thinking["data"]["text"] == "one"
+
+    def test_no_thinking_block(self, orchestrator: ClaudeOrchestrator) -> None:
+        """Test plain text yields no thinking message."""
+        assert orchestrator._extract_and_yield_thinking_block("just text") == ("", None)
+
+
+class TestRunOptions:
+    """Test per-run option handling."""
+
+    @pytest.mark.asyncio
+    async def test_run_options_do_not_leak_into_template(self, orchestrator: ClaudeOrchestrator) -> None:
+        """Test per-call overrides and SDK-side mutation never touch the stored options."""
+        captured: list[Any] = []
+        with patch("app.agents.claude.orchestrator.query", _fake_query(captured=captured)):
+            await _collect(orchestrator, system_prompt="override")
+
+        options = captured[0]
+        assert options.system_prompt == "override"
+        options.allowed_tools.append("Extra")
+        options.mcp_servers["extra"] = {}
+
+        assert "system_prompt" not in orchestrator.claude_options
+        assert "Extra" not in orchestrator.claude_options["allowed_tools"]
+        assert orchestrator.claude_options["mcp_servers"] == {}
+
+
+class TestRunDispatch:
+    """Test conversion of SDK messages into stream events."""
+
+    @pytest.mark.asyncio
+    async def test_converts_each_message_type(self, orchestrator: ClaudeOrchestrator) -> None:
+        """Test every supported message and block type maps to its event."""
+        responses = [
+            SystemMessage(subtype="init", data={"session": "s"}),
+            AssistantMessage(
+                content=[
+                    TextBlock(text="<thinking>hmm</thinking>Hello"),
+                    ThinkingBlock(thinking="deep", signature="sig"),
+                    ToolUseBlock(id="t1", name="Write", input={"file_path": "a.md"}),
+                ],
+                model="claude",
+            ),
+            UserMessage(
+                content=[
+                    ToolResultBlock(tool_use_id="t1", content="ok"),
+                    {"type": "tool_result", "tool_use_id": "t2", "content": "legacy"},
+                    {"type": "other"},
+                ]
+            ),
+            ResultMessage(
+                subtype="success",
+                duration_ms=10,
+                duration_api_ms=5,
+                is_error=False,
+                num_turns=1,
+                session_id="llm-session",
+            ),
+        ]
+        with patch("app.agents.claude.orchestrator.query", _fake_query(*responses)):
+            events = await _collect(orchestrator)
+
+        assert [event["type"] for event in events] == [
+            "system",
+            "thinking",
+            "text",
+            "thinking",
+            "tool_call",
+            "tool_result",
+            "tool_result",
+            "finish",
+        ]
+        assert events[2]["data"]["text"] == "Hello"
+        assert events[4] == {
+            "type": "tool_call",
+            "toolCallId": "t1",
+            "toolName": "create_file",
+            "args": {"file_path": "a.md"},
+        }
+        assert events[6] == {"type": "tool_result", "toolCallId": "t2", "result": "legacy"}
+        assert events[7]["data"]["finishReason"] == "stop"
+        assert events[7]["data"]["session_id"] == "llm-session"
+
+    @pytest.mark.asyncio
+    async def test_coalesces_consecutive_text_blocks(self, orchestrator: ClaudeOrchestrator) -> None:
+        """Test adjacent text blocks are merged and flushed at thinking/tool boundaries."""
+        response = AssistantMessage(
+            content=[
+                TextBlock(text="one"),
+                TextBlock(text="two"),
+                TextBlock(text="<thinking>why</thinking>three"),
+                TextBlock(text="four"),
+                ToolUseBlock(id="t1", name="Read", input={}),
+                TextBlock(text="five"),
+            ],
+            model="claude",
+        )
+        with patch("app.agents.claude.orchestrator.query", _fake_query(response)):
+            events = await _collect(orchestrator)
+
+        assert [(event["type"], event.get("data", {}).get("text")) for event in events] == [
+            ("text", "one\n\ntwo"),
+            ("thinking", "why"),
+            ("text", "three\n\nfour"),
+            ("tool_call", None),
+            ("text", "five"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_query_failure_yields_error_finish(self, orchestrator: ClaudeOrchestrator) -> None:
+        """Test SDK failures are surfaced as an error finish event."""
+        with patch("app.agents.claude.orchestrator.query", side_effect=RuntimeError("boom")):
+            events = await _collect(orchestrator)
+
+        assert events == [
+            {"type": "finish", "data": {"finishReason": "error", "message": "Claude Code SDK query failed: boom"}}
+        ]
@@ -0,0 +1,190 @@
+"""Tests for git operations used by agent workflows."""
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.agents.git.ops import GitOperationError, GitOps
+
+
+def _mock_process(returncode: int = 0, stderr: bytes = b"") -> MagicMock:
+    process = MagicMock()
+    process.returncode = returncode
+    process.communicate = AsyncMock(return_value=(b"", stderr))
+    return process
+
+
+class TestCloneRepository:
+    """Test GitOps.clone_repository."""
+
+    @pytest.mark.asyncio
+    async def test_clone_replaces_existing_checkout(self, tmp_path: Path) -> None:
+        """Test a stale checkout is removed before cloning."""
+        stale = tmp_path / "acme-widgets" / "stale.txt"
+        stale.parent.mkdir()
+        stale.write_text("old")
+
+        with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=_mock_process())) as mock_exec:
+            repo_path = await GitOps().clone_repository(
+                url="https://github.com/acme/widgets.git", destination_dir=tmp_path
+            )
+
+        assert repo_path == tmp_path / "acme-widgets"
+        assert not stale.exists()
+        args = mock_exec.call_args.args
+        assert args[:2] == ("git", "clone")
+        assert "--filter=blob:none" in args
+        assert "--single-branch" in args
+        assert args[-2:] == ("https://github.com/acme/widgets.git", "acme-widgets")
+
+    @pytest.mark.asyncio
+    async def test_full_clone_skips_partial_clone_flags(self, tmp_path: Path) -> None:
+        """Test shallow=False performs a regular clone."""
+        with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=_mock_process())) as mock_exec:
+            await GitOps().clone_repository(
+                url="https://github.com/acme/widgets", destination_dir=tmp_path, shallow=False
+            )
+
+        args = mock_exec.call_args.args
+        assert "--depth" not in args
+        assert "--filter=blob:none" not in args
+
+    @pytest.mark.asyncio
+    async def test_shallow_clone_options(self, tmp_path: Path) -> None:
+        """Test depth, branch scope and filter are configurable for shallow clones."""
+        with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=_mock_process())) as mock_exec:
+            await GitOps().clone_repository(
+                url="https://github.com/acme/widgets",
+                destination_dir=tmp_path,
+                depth=5,
+                single_branch=False,
+                filter_spec=None,
+            )
+
+        args = mock_exec.call_args.args
+        assert args[args.index("--depth") + 1] == "5"
+        assert "--single-branch" not in args
+        assert not any(arg.startswith("--filter") for arg in args)
+
+    @pytest.mark.asyncio
+    async def test_clone_failure_raises(self, tmp_path: Path) -> None:
+        """Test a non-zero git exit code raises GitOperationError."""
+        process = _mock_process(returncode=128, stderr=b"fatal: not found")
+        with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=process)):
+            with pytest.raises(GitOperationError, match="not found"):
+                await GitOps().clone_repository(url="https://github.com/acme/widgets", destination_dir=tmp_path)
+
+    @pytest.mark.asyncio
+    async def test_cancel_kills_clone_process(self, tmp_path: Path) -> None:
+        """Test cancelling a clone kills the git process and waits for it to exit."""
+        process = _mock_process()
+        started = asyncio.Event()
+
+        async def _communicate() -> tuple[bytes, bytes]:
+            started.set()
+            await asyncio.sleep(10)
+            return b"", b""
+
+        process.communicate = AsyncMock(side_effect=_communicate)
+        process.wait = AsyncMock(return_value=-9)
+        with patch("asyncio.create_subprocess_exec", AsyncMock(return_value=process)):
+            task = asyncio.create_task(
+                GitOps().clone_repository(url="https://github.com/acme/widgets", destination_dir=tmp_path)
+            )
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        process.kill.assert_called_once()
+        process.wait.assert_awaited_once()
+
+
+class TestCloneMany:
+    """Test GitOps.clone_many."""
+
+    @pytest.mark.asyncio
+    async def test_clone_many_reports_results_and_errors(self, tmp_path: Path) -> None:
+        """Test every spec yields its index with a path, and failures are yielded, not raised."""
+        git_ops = GitOps()
+
+        async def _clone(*, url: str, destination_dir: Path) -> Path:
+            if "broken" in url:
+                raise GitOperationError("boom")
+            return destination_dir / url.rsplit("/", 1)[-1]
+
+        with patch.object(git_ops, "clone_repository", side_effect=_clone):
+            results = dict(
+                [
+                    result
+                    async for result in git_ops.clone_many(
+                        [
+                            {"url": "https://github.com/acme/one", "destination_dir": tmp_path},
+                            {"url": "https://github.com/acme/broken", "destination_dir": tmp_path},
+                            {"url": "https://github.com/acme/two", "destination_dir": tmp_path},
+                        ],
+                        concurrency=2,
+                    )
+                ]
+            )
+
+        assert results[0] == tmp_path / "one"
+        assert isinstance(results[1], GitOperationError)
+        assert results[2] == tmp_path / "two"
+
+    @pytest.mark.asyncio
+    async def test_shared_checkout_dir_clones_serially(self, tmp_path: Path) -> None:
+        """Test specs sharing a checkout dir never clone, or run on_cloned, at the same time."""
+        git_ops = GitOps()
+        active: set[Path] = set()
+        overlapped = False
+
+        async def _clone(*, url: str, destination_dir: Path) -> Path:
+            nonlocal overlapped
+            repo_path = git_ops.checkout_path(url=url, destination_dir=destination_dir)
+            overlapped = overlapped or repo_path in active
+            active.add(repo_path)
+            await asyncio.sleep(0.01)
+            return repo_path
+
+        async def _on_cloned(index: int, repo_path: Path) -> None:
+            await asyncio.sleep(0.01)
+            active.discard(repo_path)
+
+        specs = [
+            {"url": "https://github.com/acme/one", "destination_dir": tmp_path},
+            {"url": "https://github.com/acme/one.git", "destination_dir": tmp_path},
+        ]
+        with patch.object(git_ops, "clone_repository", side_effect=_clone):
+            results = [result async for result in git_ops.clone_many(specs, on_cloned=_on_cloned)]
+
+        assert sorted(index for index, _ in results) == [0, 1]
+        assert not overlapped
+
+    @pytest.mark.asyncio
+    async def test_early_close_cancels_clones(self, tmp_path: Path) -> None:
+        """Test closing the iterator cancels clones still in flight before it returns."""
+        git_ops = GitOps()
+        cancelled = asyncio.Event()
+
+        async def _clone(*, url: str, destination_dir: Path) -> Path:
+            if "slow" in url:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            return destination_dir
+
+        specs = [
+            {"url": "https://github.com/acme/slow", "destination_dir": tmp_path},
+            {"url": "https://github.com/acme/fast", "destination_dir": tmp_path},
+        ]
+        with patch.object(git_ops, "clone_repository", side_effect=_clone):
+            results = git_ops.clone_many(specs)
+            assert await anext(results) == (1, tmp_path)
+            await results.aclose()
+
+        assert cancelled.is_set()
@@ -0,0 +1,42 @@
+"""Tests for the Jinja2 template renderer."""
+
+import pytest
+
+from app.core.template_renderer import create_agent_renderer, create_mcp_renderer
+
+
+class TestTemplateRenderer:
+    """Test shared template renderers."""
+
+    def test_renderers_are_shared(self) -> None:
+        """Test factories return one renderer per template type."""
+        assert create_agent_renderer() is create_agent_renderer()
+        assert create_mcp_renderer() is create_mcp_renderer()
+        assert create_agent_renderer() is not create_mcp_renderer()
+
+    def test_templates_are_compiled_once(self) -> None:
+        """Test repeated lookups reuse the compiled template."""
+        env = create_agent_renderer().env
+        assert env.get_template("code_analysis/system.md") is env.get_template("code_analysis/system.md")
+
+    def test_precompile_agent_templates(self) -> None:
+        """Test precompiling a folder compiles each of its templates."""
+        renderer = create_agent_renderer()
+        assert renderer.precompile("code_reviewer/") == 3
+        assert renderer.precompile("missing/") == 0
+
+    def test_workflow_templates_are_precompiled(self) -> None:
+        """Test defining a workflow class compiles its prompt templates."""
+        import app.agents.workflows.code_analysis  # noqa: F401
+
+        env = create_agent_renderer().env
+        assert env.cache is not None
+        cached = {name for _, name in env.cache.keys()}
+        assert {"code_analysis/system.md", "code_analysis/user.md"} <= cached
+
+    @pytest.mark.asyncio
+    async def test_render_agent_template(self) -> None:
+        """Test an agent prompt template renders to text."""
+        rendered = await create_agent_renderer().render(template_name="code_analysis/system.md", context={"mcps": []})
+        assert isinstance(rendered, str)
+        assert rendered
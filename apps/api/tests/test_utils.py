@@ -1,4 +1,10 @@
-from app.utils.helpers import generate_session_id, sanitize_prompt
+from app.utils.helpers import (
+    generate_session_id,
+    is_github_url,
+    sanitize_prompt,
+    stable_digest,
+    try_parse_json_content,
+)
 
 
 def test_sanitize_prompt_normal() -> None:
@@ -64,3 +70,32 @@ def test_generate_session_id_format() -> None:
     assert parts[0] == "claude"
     assert parts[1] == "session"
     assert len(parts[2]) == 12  # UUID hex[:12]
+
+
+def test_stable_digest_is_deterministic() -> None:
+    """Test digests are stable, 128-bit, and differ per input"""
+    digest = stable_digest("https://github.com/acme/widgets")
+    assert digest == stable_digest("https://github.com/acme/widgets")
+    assert len(digest) == 32
+    assert digest != stable_digest("https://github.com/acme/gadgets")
+
+
+def test_is_github_url() -> None:
+    """Test GitHub host detection across URL forms"""
+    assert is_github_url("https://github.com/acme/widgets")
+    assert is_github_url("HTTPS://GitHub.com/acme/widgets.git")
+    assert is_github_url("https://x-access-token:t@github.com:443/acme/widgets")
+    assert is_github_url("https://www.github.com/acme/widgets")
+    assert is_github_url("git@github.com:acme/widgets.git")
+    assert not is_github_url("https://gitlab.com/acme/widgets")
+    assert not is_github_url("https://evilgithub.com/acme/widgets")
+    assert not is_github_url("https://gitlab.com/github.com/widgets")
+    assert not is_github_url("github.com/acme/widgets")
+
+
+def test_try_parse_json_content() -> None:
+    """Test parsing str, bytes, dict and invalid content"""
+    assert try_parse_json_content('{"id": "x"}') == {"id": "x"}
+    assert try_parse_json_content(b'{"id": "x"}') == {"id": "x"}
+    assert try_parse_json_content({"id": "x"}) == {"id": "x"}
+    assert try_parse_json_content("not json") is None